@@ -10,27 +10,93 @@ Usage:
 """
 
 from fastmcp import FastMCP
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
+import asyncio
+import functools
 import os
 import sys
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.dynamic_server_loader import get_loader
-from utils.mcp_installer import MCPInstaller
-from utils.tool_searcher import ToolSearcher
-
 # Initialize FastMCP server
 mcp = FastMCP("mcp-proxy")
 
-# Initialize components
-mcp_installer = MCPInstaller()
-server_loader = get_loader()
-tool_searcher = ToolSearcher(server_loader)
+
+def safe_tool(error_prefix: Optional[str] = None):
+    """
+    Decorator turning exceptions raised by a tool handler into an error dict.
+
+    Works for both sync and async handlers.
+
+    Args:
+        error_prefix: Text put in front of the exception message, e.g.
+                      "Failed to load server" (default: message only)
+
+    Returns:
+        Decorator for the handler
+    """
+    def format_error(e: Exception) -> dict:
+        message = f"{error_prefix}: {str(e)}" if error_prefix else str(e)
+        return {
+            "success": False,
+            "error": message
+        }
+
+    def decorator(fn):
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                try:
+                    return await fn(*args, **kwargs)
+                except Exception as e:
+                    return format_error(e)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                return format_error(e)
+        return wrapper
+
+    return decorator
+
+
+# Components are created on first use so sessions that never touch the
+# installer or search tools don't pay for them at startup.
+
+@functools.cache
+def _installer():
+    """Get the shared MCPInstaller, creating it on first use."""
+    from utils.mcp_installer import MCPInstaller
+    return MCPInstaller()
+
+
+@functools.cache
+def _loader():
+    """Get the shared DynamicServerLoader, creating it on first use."""
+    from utils.dynamic_server_loader import get_loader
+    return get_loader()
+
+
+@functools.cache
+def _searcher():
+    """Get the shared ToolSearcher, creating it on first use."""
+    from utils.tool_searcher import ToolSearcher
+    return ToolSearcher(_loader())
+
+
+@functools.cache
+def _results():
+    """Get the shared ResultStore, creating it on first use."""
+    from utils.result_store import ResultStore
+    return ResultStore()
 
 
 @mcp.tool()
+@safe_tool("Failed to load server")
 def load_mcp_server_dynamically(server_name: str) -> dict:
     """
     Load an MCP server dynamically without restarting Claude Code.
@@ -57,19 +123,42 @@ def load_mcp_server_dynamically(server_name: str) -> dict:
         - Can load multiple servers simultaneously
         - Use get_loaded_servers() to see what's loaded
     """
-    try:
-        result = server_loader.load_server(server_name)
-        return result
+    return _loader().load_server(server_name)
 
-    except Exception as e:
-        return {
-            "success": False,
-            "error": f"Failed to load server: {str(e)}"
-        }
+
+@mcp.tool()
+@safe_tool("Failed to load servers")
+async def load_mcp_servers_dynamically(server_names: List[str]) -> dict:
+    """
+    Load several MCP servers at once.
+
+    Servers start in parallel, so warming up N servers takes about as long
+    as the slowest one instead of the sum of all of them.
+
+    Args:
+        server_names: Names of the servers to load (must be in .mcp.json)
+
+    Returns:
+        Dictionary with the load result of each server
+
+    Example:
+        load_mcp_servers_dynamically(["database", "stripe", "email"])
+
+    Usage Notes:
+        - A server that fails to load doesn't affect the others
+        - Already loaded servers are reported as loaded
+    """
+    results = await asyncio.to_thread(_loader().load_servers, server_names)
+    return {
+        "success": all(r.get("success") for r in results.values()),
+        "servers": results,
+        "count": len(results)
+    }
 
 
 @mcp.tool()
-def call_dynamic_server_tool(
+@safe_tool("Failed to call tool")
+async def call_dynamic_server_tool(
     server_name: str,
     tool_name: str,
     parameters: Optional[Dict[str, Any]] = None
@@ -107,26 +196,135 @@ def call_dynamic_server_tool(
         - Server loads automatically if not already loaded
         - Results returned directly from the tool
         - Supports all parameter types (strings, numbers, objects, arrays)
+        - Waits for the response without blocking the event loop, so
+          concurrent calls don't wait on each other
+        - Results larger than 32 KB are returned as a handle with a preview;
+          read them with fetch_result_handle()
     """
-    try:
-        result = server_loader.call_tool(server_name, tool_name, parameters)
-        return result
+    result = await _loader().acall_tool(server_name, tool_name, parameters)
+    return _results().maybe_spill(result)
 
-    except Exception as e:
-        return {
-            "success": False,
-            "error": f"Failed to call tool: {str(e)}"
-        }
+
+@mcp.tool()
+@safe_tool()
+def fetch_result_handle(handle: str, offset: int = 0, length: int = 32768) -> dict:
+    """
+    Read a page of a large tool result that was returned as a handle.
+
+    call_dynamic_server_tool() returns {"handle": "mcp-proxy://cache/...", "preview": ...}
+    instead of the full result when it is too large. Use this tool to read
+    the serialized JSON result in pages. Handles expire after a day, or
+    sooner once newer large results fill the cache.
+
+    Args:
+        handle: Handle returned by call_dynamic_server_tool()
+        offset: Byte offset to start reading from (default: 0)
+        length: Maximum number of bytes to return (default: 32768)
+
+    Returns:
+        Dictionary with the requested slice and the offset of the next page
+
+    Example:
+        page = fetch_result_handle("mcp-proxy://cache/0123...", offset=0)
+        # Continue with offset=page["next_offset"] until it is None
+    """
+    return _results().fetch(handle, offset, length)
+
+
+@mcp.tool()
+@safe_tool("Failed to call tools")
+async def batch_call_dynamic_server_tools(calls: List[Dict[str, Any]]) -> dict:
+    """
+    Call several tools on dynamically loaded MCP servers in one round-trip.
+
+    All calls are dispatched concurrently. Each server is loaded at most
+    once before its calls are sent, and results come back in input order.
+
+    Args:
+        calls: List of calls, each a dict with "server_name", "tool_name"
+               and optional "parameters"
+
+    Returns:
+        Dictionary with a result entry per call, in input order
+
+    Examples:
+        batch_call_dynamic_server_tools([
+            {"server_name": "database", "tool_name": "get_customer", "parameters": {"id": 123}},
+            {"server_name": "stripe", "tool_name": "get_balance"},
+            {"server_name": "database", "tool_name": "get_orders", "parameters": {"customer_id": 123}}
+        ])
+
+    Usage Notes:
+        - Each result is what call_dynamic_server_tool() returns for that call
+          (including handles for large results), or {"success": False, "error": ...}
+        - A failing call doesn't affect the others
+        - Servers load automatically if needed
+    """
+    loader = _loader()
+    results: List[Optional[dict]] = [None] * len(calls)
+
+    # Validate and group calls by server
+    by_server: Dict[str, List[int]] = {}
+    for i, call in enumerate(calls):
+        if not isinstance(call, dict) or not call.get("server_name") or not call.get("tool_name"):
+            results[i] = {
+                "success": False,
+                "error": "Each call needs 'server_name' and 'tool_name'"
+            }
+            continue
+        by_server.setdefault(call["server_name"], []).append(i)
+
+    async def run_server_calls(server_name: str, indices: List[int]):
+        # Load once up front so concurrent calls don't each try to start the server
+        if not loader.is_server_loaded(server_name):
+            load_result = await asyncio.to_thread(loader.load_server, server_name)
+            if not load_result.get("success"):
+                for i in indices:
+                    results[i] = {"success": False, "error": load_result.get("error")}
+                return
+
+        outcomes = await asyncio.gather(
+            *[
+                loader.acall_tool(server_name, calls[i]["tool_name"], calls[i].get("parameters"))
+                for i in indices
+            ],
+            return_exceptions=True
+        )
+        for i, outcome in zip(indices, outcomes):
+            if isinstance(outcome, Exception):
+                results[i] = {"success": False, "error": f"Failed to call tool: {str(outcome)}"}
+            elif isinstance(outcome, dict) and outcome.get("success") is False:
+                results[i] = {"success": False, "error": outcome.get("error")}
+            else:
+                # Same shape as call_dynamic_server_tool()
+                results[i] = _results().maybe_spill(outcome)
+
+    await asyncio.gather(*[
+        run_server_calls(server_name, indices)
+        for server_name, indices in by_server.items()
+    ])
+
+    return {
+        "success": True,
+        "results": results,
+        "count": len(results)
+    }
 
 
 @mcp.tool()
-def get_loaded_servers() -> dict:
+@safe_tool()
+def get_loaded_servers(cache_only: bool = False, force_rebuild: bool = False) -> dict:
     """
     Get information about all dynamically loaded MCP servers.
 
     Shows which servers are currently loaded, their status, and
     available tools from each server.
 
+    Args:
+        cache_only: Return the last known state without probing server
+                    processes (cheap to poll, may be slightly stale)
+        force_rebuild: Re-list the tools of every loaded server first
+
     Returns:
         Dictionary with loaded server information
 
@@ -138,18 +336,13 @@ def get_loaded_servers() -> dict:
         - Shows only dynamically loaded servers (not native Claude Code servers)
         - Indicates if server process is still running
         - Lists all tools available from each server
+        - Use cache_only=True for cheap polling between agent turns
     """
-    try:
-        return server_loader.get_loaded_servers()
-
-    except Exception as e:
-        return {
-            "success": False,
-            "error": str(e)
-        }
+    return _loader().get_loaded_servers(cache_only=cache_only, force_rebuild=force_rebuild)
 
 
 @mcp.tool()
+@safe_tool()
 def reload_mcp_server(server_name: str) -> dict:
     """
     Reload an MCP server to pick up changes.
@@ -176,17 +369,11 @@ def reload_mcp_server(server_name: str) -> dict:
         - Refreshes available tools
         - Use this instead of restarting Claude Code
     """
-    try:
-        return server_loader.reload_server(server_name)
-
-    except Exception as e:
-        return {
-            "success": False,
-            "error": str(e)
-        }
+    return _loader().reload_server(server_name)
 
 
 @mcp.tool()
+@safe_tool()
 def unload_mcp_server(server_name: str) -> dict:
     """
     Unload a dynamically loaded MCP server.
@@ -203,17 +390,11 @@ def unload_mcp_server(server_name: str) -> dict:
     Example:
         unload_mcp_server("my-server")
     """
-    try:
-        return server_loader.unload_server(server_name)
-
-    except Exception as e:
-        return {
-            "success": False,
-            "error": str(e)
-        }
+    return _loader().unload_server(server_name)
 
 
 @mcp.tool()
+@safe_tool()
 def list_available_servers() -> dict:
     """
     List all servers configured in .mcp.json.
@@ -223,23 +404,17 @@ def list_available_servers() -> dict:
     Returns:
         Dictionary with list of available server names
     """
-    try:
-        servers = server_loader.get_available_servers()
-        return {
-            "success": True,
-            "servers": servers,
-            "count": len(servers)
-        }
-
-    except Exception as e:
-        return {
-            "success": False,
-            "error": str(e)
-        }
+    servers = _loader().get_available_servers()
+    return {
+        "success": True,
+        "servers": servers,
+        "count": len(servers)
+    }
 
 
 @mcp.tool()
-def install_mcp_server_from_git(
+@safe_tool("Installation failed")
+async def install_mcp_server_from_git(
     git_url: str,
     server_name: Optional[str] = None,
     server_file: Optional[str] = None,
@@ -286,39 +461,32 @@ def install_mcp_server_from_git(
         - Dependencies are installed in the current Python environment
         - After installation, use load_mcp_server_dynamically() to load it
     """
-    try:
-        success = mcp_installer.install_from_git(
-            git_url=git_url,
-            server_name=server_name,
-            server_file=server_file,
-            env_vars=env_vars,
-            requirements_file=requirements_file,
-            auto_detect=auto_detect
-        )
-
-        if success:
-            final_name = server_name or mcp_installer._parse_git_url(git_url)[0]
-            return {
-                "success": True,
-                "message": f"Successfully installed MCP server from {git_url}",
-                "server_name": final_name,
-                "next_step": f"Use load_mcp_server_dynamically('{final_name}') to load it"
-            }
-        else:
-            return {
-                "success": False,
-                "error": "Installation failed. Check the logs for details."
-            }
-
-    except Exception as e:
+    success, final_name = await _installer().ainstall_from_git(
+        git_url=git_url,
+        server_name=server_name,
+        server_file=server_file,
+        env_vars=env_vars,
+        requirements_file=requirements_file,
+        auto_detect=auto_detect
+    )
+
+    if success:
+        return {
+            "success": True,
+            "message": f"Successfully installed MCP server from {git_url}",
+            "server_name": final_name,
+            "next_step": f"Use load_mcp_server_dynamically('{final_name}') to load it"
+        }
+    else:
         return {
             "success": False,
-            "error": f"Installation failed: {str(e)}"
+            "error": "Installation failed. Check the logs for details."
         }
 
 
 @mcp.tool()
-def install_and_load_mcp_server(
+@safe_tool("Failed to install and load server")
+async def install_and_load_mcp_server(
     git_url: str,
     server_name: Optional[str] = None,
     server_file: Optional[str] = None,
@@ -358,53 +526,54 @@ def install_and_load_mcp_server(
         - No restart required!
         - Server tools available immediately after installation
         - Perfect for quick experimentation with new servers
+        - Reinstalling an already loaded server reloads it with the new code
     """
-    try:
-        # Step 1: Install
-        install_result = mcp_installer.install_from_git(
+    # The loader's preflight needs the server name before the install reports it
+    final_server_name = server_name or _installer()._parse_git_url(git_url)[0]
+
+    # Step 1: Install, while the loader runs its preflight check in parallel
+    (install_result, final_server_name), preflight = await asyncio.gather(
+        _installer().ainstall_from_git(
             git_url=git_url,
             server_name=server_name,
             server_file=server_file,
             env_vars=env_vars,
             requirements_file=requirements_file,
             auto_detect=auto_detect
-        )
-
-        if not install_result:
-            return {
-                "success": False,
-                "error": "Installation failed"
-            }
-
-        # Get the actual server name (might be from repo name)
-        final_server_name = server_name or mcp_installer._parse_git_url(git_url)[0]
+        ),
+        asyncio.to_thread(_loader()._preflight, final_server_name)
+    )
 
-        # Step 2: Load dynamically
-        load_result = server_loader.load_server(final_server_name)
+    if not install_result:
+        return {
+            "success": False,
+            "error": "Installation failed"
+        }
 
-        if load_result.get("success"):
-            return {
-                "success": True,
-                "message": f"Installed and loaded '{final_server_name}' successfully",
-                "server_name": final_server_name,
-                "tools": load_result.get("tools", []),
-                "tool_count": load_result.get("tool_count", 0),
-                "note": "Server is ready to use immediately - no restart required!"
-            }
-        else:
-            return {
-                "success": False,
-                "error": f"Installation succeeded but loading failed: {load_result.get('error')}"
-            }
+    # Step 2: Load dynamically (reload if an old instance is still running)
+    if preflight.get("loaded"):
+        load_result = await asyncio.to_thread(_loader().reload_server, final_server_name)
+    else:
+        load_result = await asyncio.to_thread(_loader().load_server, final_server_name)
 
-    except Exception as e:
+    if load_result.get("success"):
+        return {
+            "success": True,
+            "message": f"Installed and loaded '{final_server_name}' successfully",
+            "server_name": final_server_name,
+            "tools": load_result.get("tools", []),
+            "tool_count": load_result.get("tool_count", 0),
+            "note": "Server is ready to use immediately - no restart required!"
+        }
+    else:
         return {
             "success": False,
-            "error": f"Failed to install and load server: {str(e)}"
+            "error": f"Installation succeeded but loading failed: {load_result.get('error')}"
         }
 
 
 @mcp.tool()
+@safe_tool()
 def list_installed_mcp_servers() -> dict:
     """
     List all installed MCP servers from .mcp.json configuration.
@@ -422,24 +591,18 @@ def list_installed_mcp_servers() -> dict:
         list_installed_mcp_servers()
         # Returns all servers with their configuration details
     """
-    try:
-        servers = mcp_installer.list_installed()
-
-        return {
-            "success": True,
-            "servers": servers,
-            "count": len(servers),
-            "config_file": str(mcp_installer.config_file)
-        }
+    servers = _installer().list_installed()
 
-    except Exception as e:
-        return {
-            "success": False,
-            "error": str(e)
-        }
+    return {
+        "success": True,
+        "servers": servers,
+        "count": len(servers),
+        "config_file": str(_installer().config_file)
+    }
 
 
 @mcp.tool()
+@safe_tool()
 def uninstall_mcp_server(server_name: str, delete_files: bool = False) -> dict:
     """
     Uninstall an MCP server and optionally delete its files.
@@ -461,32 +624,30 @@ def uninstall_mcp_server(server_name: str, delete_files: bool = False) -> dict:
         # Remove from config and delete files
         uninstall_mcp_server("my-server", delete_files=True)
     """
-    try:
-        success = mcp_installer.uninstall(server_name, delete_files)
-
-        if success:
-            return {
-                "success": True,
-                "message": f"Successfully uninstalled '{server_name}'",
-                "files_deleted": delete_files
-            }
-        else:
-            return {
-                "success": False,
-                "error": f"Failed to uninstall '{server_name}'"
-            }
+    success = _installer().uninstall(server_name, delete_files)
 
-    except Exception as e:
+    if success:
+        return {
+            "success": True,
+            "message": f"Successfully uninstalled '{server_name}'",
+            "files_deleted": delete_files
+        }
+    else:
         return {
             "success": False,
-            "error": str(e)
+            "error": f"Failed to uninstall '{server_name}'"
         }
 
 
 # ========== TOOL SEARCH TOOLS ==========
 
 @mcp.tool()
-def search_tools(query: str, max_results: int = 10) -> dict:
+@safe_tool()
+def search_tools(
+    query: str,
+    max_results: int = 10,
+    detail: Literal["index", "full"] = "index"
+) -> dict:
     """
     Search for tools across all loaded MCP servers using natural language.
 
@@ -496,6 +657,8 @@ def search_tools(query: str, max_results: int = 10) -> dict:
     Args:
         query: Natural language search query (e.g., "send email", "create user", "get metrics")
         max_results: Maximum number of tools to return (default: 10)
+        detail: "index" returns name, server and a one-line summary (default);
+                "full" also includes each tool's full description and schemas
 
     Returns:
         Dictionary with matching tools ranked by relevance
@@ -508,34 +671,41 @@ def search_tools(query: str, max_results: int = 10) -> dict:
 
     Usage Notes:
         - Searches tool names and descriptions
+        - Tolerates typos when the optional rapidfuzz package is installed
         - Works across all loaded servers
         - Load servers first with load_mcp_server_dynamically()
         - Use get_tool_info() for detailed info on a specific tool
+        - Results are compact by default; schemas are fetched on demand
     """
-    try:
-        results = tool_searcher.search_tools(query, max_results)
-        return {
-            "success": True,
-            "query": query,
-            "tools": results,
-            "count": len(results),
-            "tip": "Use call_dynamic_server_tool(server, tool, params) to call any of these tools"
-        }
-
-    except Exception as e:
-        return {
-            "success": False,
-            "error": str(e)
-        }
+    results = _searcher().search_tools(query, max_results, detail)
+    return {
+        "success": True,
+        "query": query,
+        "tools": results,
+        "count": len(results),
+        "tip": "Use call_dynamic_server_tool(server, tool, params) to call any of these tools"
+    }
 
 
 @mcp.tool()
-def list_all_tools() -> dict:
+@safe_tool()
+def list_all_tools(
+    detail: Literal["index", "full"] = "index",
+    cache_only: bool = False,
+    force_rebuild: bool = False
+) -> dict:
     """
     List all tools available from all loaded MCP servers.
 
     Provides a complete inventory of every tool you can call.
 
+    Args:
+        detail: "index" returns name, server and a one-line summary (default);
+                "full" also includes each tool's full description and schemas
+        cache_only: Serve the cached tool index without re-checking servers
+                    (cheap to poll, may be slightly stale)
+        force_rebuild: Re-list tools from every loaded server and rebuild the index
+
     Returns:
         Dictionary with all tools organized by server
 
@@ -547,27 +717,22 @@ def list_all_tools() -> dict:
         - Only shows tools from loaded servers
         - Load more servers with load_mcp_server_dynamically()
         - Use search_tools() to find specific tools
+        - Use get_tool_info() to fetch the full schema of a single tool
     """
-    try:
-        tools = tool_searcher.list_all_tools()
-        servers = tool_searcher.list_servers()
-
-        return {
-            "success": True,
-            "tools": tools,
-            "count": len(tools),
-            "servers": servers,
-            "server_count": len(servers)
-        }
+    tools = _searcher().list_all_tools(detail, cache_only=cache_only, force_rebuild=force_rebuild)
+    servers = _searcher().list_servers(cache_only=cache_only)
 
-    except Exception as e:
-        return {
-            "success": False,
-            "error": str(e)
-        }
+    return {
+        "success": True,
+        "tools": tools,
+        "count": len(tools),
+        "servers": servers,
+        "server_count": len(servers)
+    }
 
 
 @mcp.tool()
+@safe_tool()
 def get_tool_info(tool_name: str) -> dict:
     """
     Get detailed information about a specific tool.
@@ -589,26 +754,19 @@ def get_tool_info(tool_name: str) -> dict:
         - Shows which server provides the tool
         - Use search_tools() first to find tool names
     """
-    try:
-        info = tool_searcher.get_tool_info(tool_name)
-
-        if info:
-            return {
-                "success": True,
-                "tool": info,
-                "call_with": f"call_dynamic_server_tool('{info.get('server')}', '{tool_name}', {{...params...}})"
-            }
-        else:
-            return {
-                "success": False,
-                "error": f"Tool '{tool_name}' not found",
-                "suggestion": "Use search_tools() or list_all_tools() to find available tools"
-            }
+    info = _searcher().get_tool_info(tool_name)
 
-    except Exception as e:
+    if info:
+        return {
+            "success": True,
+            "tool": info,
+            "call_with": f"call_dynamic_server_tool('{info.get('server')}', '{tool_name}', {{...params...}})"
+        }
+    else:
         return {
             "success": False,
-            "error": str(e)
+            "error": f"Tool '{tool_name}' not found",
+            "suggestion": "Use search_tools() or list_all_tools() to find available tools"
         }
 
 
@@ -1,7 +1,25 @@
 """MCP Proxy utility modules."""
 
-from .dynamic_server_loader import DynamicServerLoader, get_loader
-from .mcp_installer import MCPInstaller
-from .tool_searcher import ToolSearcher
+import importlib
 
-__all__ = ["DynamicServerLoader", "get_loader", "MCPInstaller", "ToolSearcher"]
+# Submodules are imported on first attribute access so that importing one
+# utility (e.g. the loader) doesn't drag in the others.
+_LAZY_EXPORTS = {
+    "DynamicServerLoader": ".dynamic_server_loader",
+    "get_loader": ".dynamic_server_loader",
+    "MCPInstaller": ".mcp_installer",
+    "ToolSearcher": ".tool_searcher",
+    "dumps": ".fast_json",
+    "loads": ".fast_json",
+}
+
+__all__ = ["DynamicServerLoader", "get_loader", "MCPInstaller", "ToolSearcher", "dumps", "loads"]
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -5,17 +5,187 @@ Load and call MCP servers dynamically at runtime without requiring Claude Code r
 Servers can be installed, loaded, and called on-the-fly.
 """
 
-import json
+import asyncio
+import atexit
+import hashlib
+import itertools
+import os
 import subprocess
 import sys
 import threading
+from array import array
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import time
 
+from .fast_json import JSONDecodeError, dumpb, loads
+from .mcp_config import load_config
+from .mcp_connection import McpConnection
+from .result_cache import ResultCache, compute_result_key
+from .swr_cache import SWRCache
+from .tool_catalog import CATALOG_FILENAME, ToolCatalog, compute_catalog_key
+from .tool_searcher import preprocess_tool
+
+# Default bound on concurrent in-flight tool calls per server
+DEFAULT_MAX_IN_FLIGHT = 32
+
+# Longest pause (seconds) between an async caller's attempts to take a full
+# server's in-flight slot
+IN_FLIGHT_POLL_MAX = 0.05
+
+# Loaded servers untouched for this many seconds are unloaded by the idle
+# reaper (override per server with "idle_timeout_s"; 0 disables)
+DEFAULT_IDLE_TIMEOUT = 300.0
+IDLE_CHECK_INTERVAL = 60.0
+
+# Tool lists are re-listed in the background once older than TOOLS_TTL_FRESH,
+# and synchronously once older than TOOLS_TTL_FRESH + TOOLS_TTL_STALE
+TOOLS_TTL_FRESH = 60.0
+TOOLS_TTL_STALE = 3600.0
+
+# A starting server must answer initialize (and tools/list) within
+# STARTUP_TIMEOUT seconds; a server that exits fails the wait immediately
+STARTUP_TIMEOUT = 30.0
+
+# Seconds to wait for a tools/call response
+CALL_TIMEOUT = 5.0
+
+# Seconds a terminated server gets to exit before it is killed, and the total
+# budget cleanup() gives all servers together
+STOP_TIMEOUT = 0.5
+CLEANUP_TIMEOUT = 2.0
+
+# Buffer size of the stdin/stdout pipes to server processes
+PIPE_BUFFER_SIZE = 65536
+
+# Params of the initialize request, encoded once
+_INITIALIZE_PARAMS = dumpb({
+    "protocolVersion": "2025-03-26",
+    "capabilities": {
+        "tools": {},
+        "resources": {},
+        "prompts": {}
+    },
+    "clientInfo": {
+        "name": "multiverse-proxy",
+        "version": "1.0.0"
+    }
+})
+
+# Environment servers are started with, snapshotted once at import as a plain
+# dict (reading os.environ decodes every entry again on each copy)
+_BASE_ENV = os.environ.copy()
+
+
+def compute_config_hash(server_config: Dict) -> str:
+    """
+    Hash the parts of a server config that determine the spawned process.
+
+    Env vars are sorted so their order doesn't matter, but args keep their
+    order since it is significant to the command.
+
+    Args:
+        server_config: Server entry from .mcp.json
+
+    Returns:
+        Hex digest identifying the process the config would launch
+    """
+    key = {
+        "command": server_config.get("command"),
+        "args": list(server_config.get("args", [])),
+        "env": sorted(server_config.get("env", {}).items()),
+        "cwd": server_config.get("cwd"),
+    }
+    return hashlib.sha256(dumpb(key)).hexdigest()
+
+
+class McpInstancePool:
+    """
+    Share server processes between servers with identical configs.
+
+    Servers whose (command, args, env) hash the same reuse one long-lived
+    process and its discovered tools. Each instance is refcounted and only
+    shut down when its last user releases it.
+    """
+
+    def __init__(self):
+        self._processes = {}  # config hash -> subprocess
+        self._tools = {}  # config hash -> {tool_name: tool_schema}
+        self._refcounts = {}  # config hash -> number of servers using it
+
+    def acquire(self, key: str) -> Optional[tuple]:
+        """
+        Take a reference to a running instance.
+
+        Args:
+            key: Config hash
+
+        Returns:
+            Tuple of (process, tools) or None if no live instance exists
+        """
+        process = self._processes.get(key)
+        if process is None:
+            return None
+        if process.poll() is not None:
+            self.discard(key)
+            return None
+        self._refcounts[key] += 1
+        return process, self._tools[key]
+
+    def add(self, key: str, process: subprocess.Popen, tools: Dict[str, Dict]):
+        """Register a freshly started instance with one reference."""
+        self._processes[key] = process
+        self._tools[key] = tools
+        self._refcounts[key] = 1
+
+    def update_tools(self, key: str, tools: Dict[str, Dict]):
+        """Replace the cached tools of an instance."""
+        if key in self._tools:
+            self._tools[key] = tools
+
+    def release(self, key: str) -> Optional[subprocess.Popen]:
+        """
+        Drop a reference to an instance.
+
+        Args:
+            key: Config hash
+
+        Returns:
+            The process if this was the last reference (caller must stop it)
+        """
+        if key not in self._refcounts:
+            return None
+        self._refcounts[key] -= 1
+        if self._refcounts[key] > 0:
+            return None
+        process = self._processes.pop(key)
+        del self._tools[key]
+        del self._refcounts[key]
+        return process
+
+    def discard(self, key: str):
+        """Forget an instance regardless of its refcount (e.g. it died)."""
+        self._processes.pop(key, None)
+        self._tools.pop(key, None)
+        self._refcounts.pop(key, None)
+
+    def clear(self):
+        """Forget all instances."""
+        self._processes.clear()
+        self._tools.clear()
+        self._refcounts.clear()
+
 
 class DynamicServerLoader:
-    """Load and manage MCP servers dynamically at runtime."""
+    """
+    Load and manage MCP servers dynamically at runtime.
+
+    Servers are stopped by cleanup(). Use the loader as a context manager
+    (``with DynamicServerLoader() as loader:``) for deterministic shutdown;
+    the global instance from get_loader() is cleaned up at exit.
+    """
 
     def __init__(self, config_file: Optional[Path] = None):
         """
@@ -25,22 +195,91 @@ class DynamicServerLoader:
             config_file: Path to .mcp.json (default: ./.mcp.json)
         """
         self.config_file = config_file or Path.cwd() / ".mcp.json"
-        self.server_processes = {}  # server_name -> subprocess
+        self.server_processes = {}  # server_name -> subprocess (None until first call if loaded from the catalog)
         self.server_tools = {}  # server_name -> {tool_name: tool_schema}
-        self.lock = threading.RLock()  # Reentrant lock to allow nested acquisition
+        # Registry lock: guards the dicts above and is only held for short
+        # bookkeeping, never while waiting on a server
+        self.lock = threading.RLock()
+        self._connections = {}  # subprocess -> McpConnection
+        # JSON-RPC ids shared by every request this loader sends; requests are
+        # pipelined, so ids must never repeat
+        self._id_counter = itertools.count(1)
+        self._listeners = []  # callbacks notified with server_name when its tools change
+        self._pool = McpInstancePool()
+        self._catalog = ToolCatalog(self.config_file.parent / CATALOG_FILENAME)
+        self._instance_keys = {}  # server_name -> config hash (None if not shared)
+        self._resolved_configs = {}  # server_name -> .mcp.json entry it was loaded with
+        self._in_flight = {}  # server_name -> semaphore bounding concurrent calls
+        self._load_locks = defaultdict(threading.Lock)  # instance key or server_name -> load lock
+        self._loaded_snapshot = None  # last get_loaded_servers() result, reset on changes
+        self._registry_version = 0  # bumped by _notify() on every change
+        self._tools_swr = SWRCache(ttl_fresh=TOOLS_TTL_FRESH, ttl_stale=TOOLS_TTL_STALE)
+        self._result_cache = ResultCache()  # results of servers with "cache_ttl"
+        # server_name -> [(catalog key, process, tools)] of started, initialized
+        # processes that reload_server() can swap in ("warm_spares")
+        self._spares = defaultdict(list)
+        self._filling_spares = set()  # server names with a spare being started
+        # Idle-tracking state as parallel arrays, indexed through _name_to_idx,
+        # so the idle reaper scans two packed float arrays. Guarded by _idle_lock
+        # so tool calls can record activity without taking the loader lock.
+        self._idle_lock = threading.Lock()
+        self._names: List[str] = []
+        self._name_to_idx: Dict[str, int] = {}
+        self._last_used = array("d")  # time.monotonic() of last load/call
+        self._idle_timeouts = array("d")  # "idle_timeout_s" (0 = never reap)
+        self._reaper = None  # idle reaper thread, see start_idle_reaper()
+        self._reaper_stop = threading.Event()
+
+    def add_listener(self, callback):
+        """
+        Register a callback invoked whenever a server's tool set changes.
+
+        The callback receives the server name after the server is loaded,
+        unloaded or has its tools refreshed.
+
+        Args:
+            callback: Callable taking a single server_name argument
+        """
+        self._listeners.append(callback)
+
+    def _notify(self, server_name: str):
+        """Notify listeners that a server's tools changed."""
+        self._registry_version += 1
+        self._loaded_snapshot = None
+        tools = self.server_tools.get(server_name)
+        if tools is not None:
+            self._tools_swr.set(server_name, tools)
+        else:
+            self._tools_swr.invalidate(server_name)
+        for callback in self._listeners:
+            callback(server_name)
 
     def _load_config(self) -> Dict:
-        """Load .mcp.json configuration."""
-        if self.config_file.exists():
-            with open(self.config_file, 'r') as f:
-                return json.load(f)
-        return {"mcpServers": {}}
+        """Load .mcp.json configuration (cached, do not mutate)."""
+        return load_config(self.config_file)
 
     def get_available_servers(self) -> List[str]:
         """Get list of all configured server names."""
-        config = self._load_config()
+        config = load_config(self.config_file, allow_stale=True)
         return list(config.get("mcpServers", {}).keys())
 
+    def _preflight(self, server_name: str) -> Dict:
+        """
+        Cheap, side-effect free check run while a server is being installed.
+
+        Warms the config cache and reports whether a previous instance of the
+        server is already running (in which case it must be reloaded rather
+        than loaded to pick up the freshly installed code).
+
+        Args:
+            server_name: Name of the server about to be loaded
+
+        Returns:
+            Dictionary with preflight info
+        """
+        self._load_config()
+        return {"loaded": self.is_server_loaded(server_name)}
+
     def is_server_loaded(self, server_name: str) -> bool:
         """Check if a server is currently loaded."""
         with self.lock:
@@ -50,6 +289,15 @@ class DynamicServerLoader:
         """
         Load an MCP server dynamically and discover its tools.
 
+        If the server's tools are in the persistent tool catalog, they are
+        served from there and the process is only started by the first tool
+        call (see _ensure_process()).
+
+        Concurrent loads of the same server (or of servers sharing an
+        instance) are deduplicated: only one process is spawned and the other
+        callers reuse it. The global lock is not held while the process
+        starts, so loads of unrelated servers run in parallel.
+
         Args:
             server_name: Name of the server to load
 
@@ -59,11 +307,7 @@ class DynamicServerLoader:
         with self.lock:
             # Check if already loaded
             if server_name in self.server_processes:
-                return {
-                    "success": True,
-                    "message": f"Server '{server_name}' already loaded",
-                    "tools": list(self.server_tools.get(server_name, {}).keys())
-                }
+                return self._already_loaded(server_name)
 
             # Load config
             config = self._load_config()
@@ -75,144 +319,421 @@ class DynamicServerLoader:
                     "error": f"Server '{server_name}' not found in .mcp.json"
                 }
 
-            try:
-                # Start the server process
-                command = server_config.get("command")
-                args = server_config.get("args", [])
-                env = {**server_config.get("env", {})}
-
-                # Start server in background
-                # Use line buffering and redirect stderr to avoid blocking
-                process = subprocess.Popen(
-                    [command] + args,
-                    stdin=subprocess.PIPE,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.DEVNULL,  # Discard stderr to avoid blocking
-                    env={**subprocess.os.environ, **env},
-                    text=True,
-                    bufsize=1  # Line buffered
-                )
-
-                # Give server time to start
-                time.sleep(0.5)
-
-                # Check if process started successfully
-                if process.poll() is not None:
-                    stderr = process.stderr.read()
+            instance_key = None
+            if not server_config.get("no_share"):
+                instance_key = compute_config_hash(server_config)
+            load_lock = self._load_locks[instance_key or server_name]
+
+        with load_lock:
+            with self.lock:
+                # Another caller may have loaded it while we waited
+                if server_name in self.server_processes:
+                    return self._already_loaded(server_name)
+
+                # Reuse a running instance with an identical config
+                shared = self._pool.acquire(instance_key) if instance_key else None
+                if shared:
+                    process, tools = shared
+                    self._register(server_name, process, tools, instance_key, server_config)
                     return {
-                        "success": False,
-                        "error": f"Server failed to start: {stderr}"
+                        "success": True,
+                        "message": f"Server '{server_name}' loaded successfully (shared instance)",
+                        "server_name": server_name,
+                        "tools": list(tools.keys()),
+                        "tool_count": len(tools)
                     }
 
-                # Discover tools using MCP protocol
-                tools = self._discover_tools(process)
-
-                # Store process and tools
-                self.server_processes[server_name] = process
-                self.server_tools[server_name] = tools
-
+            # Serve known tools from the catalog; the process starts on first use
+            tools = self._catalog.get(compute_catalog_key(server_config))
+            if tools:
+                for tool_name, tool_info in tools.items():
+                    preprocess_tool(tool_name, tool_info)
+                with self.lock:
+                    self._register(server_name, None, tools, instance_key, server_config)
                 return {
                     "success": True,
-                    "message": f"Server '{server_name}' loaded successfully",
+                    "message": f"Server '{server_name}' loaded successfully (cached tools, starts on first call)",
                     "server_name": server_name,
                     "tools": list(tools.keys()),
                     "tool_count": len(tools)
                 }
 
+            try:
+                process, tools = self._spawn(server_config)
             except Exception as e:
                 return {
                     "success": False,
                     "error": f"Failed to load server: {str(e)}"
                 }
 
-    def _initialize_server(self, process: subprocess.Popen) -> bool:
+            with self.lock:
+                # Store process and tools
+                if instance_key:
+                    self._pool.add(instance_key, process, tools)
+                self._register(server_name, process, tools, instance_key, server_config)
+
+            return {
+                "success": True,
+                "message": f"Server '{server_name}' loaded successfully",
+                "server_name": server_name,
+                "tools": list(tools.keys()),
+                "tool_count": len(tools)
+            }
+
+    def load_servers(self, server_names: List[str], max_workers: int = 8) -> Dict[str, Dict]:
         """
-        Initialize MCP server with proper handshake.
+        Load several servers concurrently.
+
+        Startup is dominated by process spawn and pipe I/O, so the servers
+        are loaded on a thread pool instead of one after another.
 
         Args:
-            process: Server subprocess
+            server_names: Names of the servers to load
+            max_workers: Maximum number of servers started at the same time
 
         Returns:
-            True if initialization successful, False otherwise
+            Dictionary mapping each server name to its load_server() result
         """
-        try:
-            # Step 1: Send initialize request
-            init_request = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "initialize",
-                "params": {
-                    "protocolVersion": "2025-03-26",
-                    "capabilities": {
-                        "tools": {},
-                        "resources": {},
-                        "prompts": {}
-                    },
-                    "clientInfo": {
-                        "name": "multiverse-proxy",
-                        "version": "1.0.0"
-                    }
+        names = list(dict.fromkeys(server_names))
+        if not names:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(names)))) as executor:
+            return dict(zip(names, executor.map(self.load_server, names)))
+
+    def _spawn(self, server_config: Dict) -> Tuple[subprocess.Popen, Dict[str, Dict]]:
+        """
+        Start a server process and discover its tools.
+
+        Successfully discovered tools are written through to the tool catalog.
+
+        Args:
+            server_config: Server entry from .mcp.json
+
+        Returns:
+            Tuple of (process, tools)
+
+        Raises:
+            RuntimeError: If the process exits during startup
+        """
+        # Start the server process
+        command = server_config.get("command")
+        args = server_config.get("args", [])
+        env = server_config.get("env")
+
+        # Start server in background
+        # Binary, block-buffered pipes (every message is flushed explicitly);
+        # stderr is drained by the connection, which keeps its last lines
+        process = subprocess.Popen(
+            [command] + args,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            # Without extra env vars the child simply inherits ours
+            env={**_BASE_ENV, **env} if env else None,
+            cwd=server_config.get("cwd") or None,
+            bufsize=PIPE_BUFFER_SIZE
+        )
+
+        connection = McpConnection(process)
+
+        # Discover tools using MCP protocol; the handshake doubles as the readiness check
+        tools = self._discover_tools(connection)
+
+        # Check if process started successfully
+        if connection.closed:
+            message = f"Server failed to start (exit code {process.poll()})"
+            stderr_tail = connection.stderr_tail(wait=1.0)
+            if stderr_tail:
+                message += ": " + "\n".join(stderr_tail)
+            raise RuntimeError(message)
+
+        with self.lock:
+            self._connections[process] = connection
+        if tools:
+            self._catalog.put(compute_catalog_key(server_config), tools)
+        return process, tools
+
+    def _ensure_process(self, server_name: str) -> Optional[Dict]:
+        """
+        Start the process of a server that was loaded from the tool catalog.
+
+        Args:
+            server_name: Name of a loaded server
+
+        Returns:
+            None once the server has a process, or an error dict
+        """
+        with self.lock:
+            if self.server_processes.get(server_name) is not None:
+                return None
+            if server_name not in self.server_processes:
+                return {
+                    "success": False,
+                    "error": f"Server '{server_name}' not loaded"
                 }
-            }
+            server_config = self._resolved_configs[server_name]
+            instance_key = self._instance_keys.get(server_name)
+            load_lock = self._load_locks[instance_key or server_name]
+
+        with load_lock:
+            with self.lock:
+                # Another caller may have started it while we waited
+                if server_name not in self.server_processes:
+                    return {
+                        "success": False,
+                        "error": f"Server '{server_name}' not loaded"
+                    }
+                if self.server_processes[server_name] is not None:
+                    return None
 
-            process.stdin.write(json.dumps(init_request) + "\n")
-            process.stdin.flush()
+                shared = self._pool.acquire(instance_key) if instance_key else None
 
-            # Step 2: Read initialize response
-            response_line = process.stdout.readline()
-            response = json.loads(response_line)
+            if shared:
+                process, tools = shared
+            else:
+                try:
+                    process, tools = self._spawn(server_config)
+                except Exception as e:
+                    return {
+                        "success": False,
+                        "error": f"Failed to start server: {str(e)}"
+                    }
+
+            with self.lock:
+                if server_name not in self.server_processes:
+                    # Unloaded while starting
+                    if shared:
+                        self._pool.release(instance_key)
+                    else:
+                        self._connections.pop(process, None)
+                        process.terminate()
+                    return {
+                        "success": False,
+                        "error": f"Server '{server_name}' not loaded"
+                    }
+                if instance_key and not shared:
+                    self._pool.add(instance_key, process, tools)
+                self.server_processes[server_name] = process
+                self.server_tools[server_name] = tools
+                self._notify(server_name)
+            return None
+
+    def _register(
+        self,
+        server_name: str,
+        process: Optional[subprocess.Popen],
+        tools: Dict[str, Dict],
+        instance_key: Optional[str],
+        server_config: Dict
+    ):
+        """Record a newly loaded server. Caller must hold self.lock."""
+        self.server_processes[server_name] = process
+        self.server_tools[server_name] = tools
+        self._instance_keys[server_name] = instance_key
+        self._resolved_configs[server_name] = server_config
+        self._track(server_name, server_config)
+        self._notify(server_name)
+        self._request_spares(server_name, server_config)
+
+    def _request_spares(self, server_name: str, server_config: Dict):
+        """
+        Top up a server's warm spares in the background. Caller must hold self.lock.
+
+        The number of spares comes from the server's "warm_spares" key in
+        .mcp.json (default: 0).
+        """
+        count = int(server_config.get("warm_spares", 0) or 0)
+        if count <= 0 or server_name in self._filling_spares:
+            return
+        if len(self._spares.get(server_name, ())) >= count:
+            return
+        self._filling_spares.add(server_name)
+        threading.Thread(
+            target=self._fill_spares,
+            args=(server_name, server_config, count),
+            name=f"mcp-spares-{server_name}",
+            daemon=True
+        ).start()
+
+    def _fill_spares(self, server_name: str, server_config: Dict, count: int):
+        """Start spare processes until a loaded server has count of them."""
+        try:
+            while True:
+                with self.lock:
+                    if server_name not in self.server_processes:
+                        return
+                    if len(self._spares.get(server_name, ())) >= count:
+                        return
+
+                # Key the spare by the code it was started from
+                key = compute_catalog_key(server_config)
+                process, tools = self._spawn(server_config)
+
+                with self.lock:
+                    loaded = server_name in self.server_processes
+                    if loaded:
+                        self._spares[server_name].append((key, process, tools))
+                if not loaded:
+                    self._stop_spares([(key, process, tools)])
+                    return
+        except Exception as e:
+            print(f"Warning: Could not start a spare for '{server_name}': {e}", file=sys.stderr)
+        finally:
+            with self.lock:
+                self._filling_spares.discard(server_name)
+
+    def _take_spare(self, server_name: str, server_config: Dict) -> Optional[Tuple[subprocess.Popen, Dict]]:
+        """
+        Take a warm spare that still matches a server's config and code.
+
+        Spares started from an outdated config or older command/script files
+        are stopped.
+
+        Args:
+            server_name: Name of the server
+            server_config: Current server entry from .mcp.json
+
+        Returns:
+            Tuple of (process, tools), or None if no usable spare exists
+        """
+        key = compute_catalog_key(server_config)
+        with self.lock:
+            spares = self._spares.pop(server_name, [])
+            usable = []
+            stale = []
+            for spare in spares:
+                spare_key, process, _ = spare
+                connection = self._connections.get(process)
+                if (spare_key == key and process.poll() is None
+                        and connection is not None and not connection.closed):
+                    usable.append(spare)
+                else:
+                    stale.append(spare)
+            if usable[1:]:
+                self._spares[server_name].extend(usable[1:])
+
+        self._stop_spares(stale)
+        if not usable:
+            return None
+        _, process, tools = usable[0]
+        return process, tools
+
+    def _promote_spare(
+        self,
+        server_name: str,
+        server_config: Dict,
+        process: subprocess.Popen,
+        tools: Dict[str, Dict]
+    ) -> Dict:
+        """Load a server using a spare process from _take_spare()."""
+        instance_key = None
+        if not server_config.get("no_share"):
+            instance_key = compute_config_hash(server_config)
+
+        with self._load_locks[instance_key or server_name]:
+            with self.lock:
+                shared = instance_key and self._pool.acquire(instance_key)
+                if shared:
+                    self._pool.release(instance_key)
+                promoted = server_name not in self.server_processes and not shared
+                if promoted:
+                    if instance_key:
+                        self._pool.add(instance_key, process, tools)
+                    self._register(server_name, process, tools, instance_key, server_config)
+
+        if not promoted:
+            # Someone else loaded it meanwhile
+            self._stop_spares([(None, process, tools)])
+            return self.load_server(server_name)
+
+        if tools:
+            self._catalog.put(compute_catalog_key(server_config), tools)
+        return {
+            "success": True,
+            "message": f"Server '{server_name}' loaded successfully (warm spare)",
+            "server_name": server_name,
+            "tools": list(tools.keys()),
+            "tool_count": len(tools)
+        }
+
+    def _stop_spares(self, spares: List[Tuple]):
+        """Stop spare processes on background threads."""
+        for _, process, _ in spares:
+            with self.lock:
+                self._connections.pop(process, None)
+            threading.Thread(target=_stop_process, args=(process,), daemon=True).start()
+
+    def _already_loaded(self, server_name: str) -> Dict:
+        """Result returned when loading a server that is already loaded."""
+        return {
+            "success": True,
+            "message": f"Server '{server_name}' already loaded",
+            "tools": list(self.server_tools.get(server_name, {}).keys())
+        }
+
+    def _initialize_server(self, connection: McpConnection) -> bool:
+        """
+        Initialize MCP server with proper handshake.
+
+        Args:
+            connection: Connection to the server subprocess
+
+        Returns:
+            True if initialization successful, False otherwise
+        """
+        try:
+            # Step 1: Send initialize request and wait for the response (its
+            # arrival means the server is ready)
+            request_id = self._next_request_id()
+            future = connection.request("initialize", _INITIALIZE_PARAMS, request_id=request_id)
+            response = future.result(timeout=STARTUP_TIMEOUT)
 
             if "error" in response:
                 print(f"Initialization error: {response['error']}")
                 return False
 
-            # Step 3: Send initialized notification
+            # Step 2: Send initialized notification
             # NOTE: Notifications do NOT get responses - don't try to read one!
-            initialized_notification = {
-                "jsonrpc": "2.0",
-                "method": "notifications/initialized"
-            }
-
-            process.stdin.write(json.dumps(initialized_notification) + "\n")
-            process.stdin.flush()
-
-            # Small delay to let server process the notification
-            time.sleep(0.1)
+            # The server handles stdin in order, so tools/list can follow right away
+            connection.notify("notifications/initialized")
 
             return True
 
+        except FutureTimeoutError:
+            connection.cancel(request_id)
+            print(f"Server did not answer initialize within {STARTUP_TIMEOUT}s")
+            return False
+
         except Exception as e:
             print(f"Failed to initialize server: {e}")
             return False
 
-    def _discover_tools(self, process: subprocess.Popen) -> Dict[str, Dict]:
+    def _discover_tools(self, connection: McpConnection, initialize: bool = True) -> Dict[str, Dict]:
         """
         Discover available tools from an MCP server using the MCP protocol.
 
         Args:
-            process: Server subprocess
+            connection: Connection to the server subprocess
+            initialize: Perform the MCP handshake first (False for an
+                already-initialized session)
 
         Returns:
             Dictionary mapping tool names to their schemas
         """
         try:
             # Initialize server first
-            if not self._initialize_server(process):
+            if initialize and not self._initialize_server(connection):
                 return {}
 
             # Now send list_tools request
-            request = {
-                "jsonrpc": "2.0",
-                "method": "tools/list",
-                "id": 2
-            }
-
-            process.stdin.write(json.dumps(request) + "\n")
-            process.stdin.flush()
-
-            # Read response
-            response_line = process.stdout.readline()
-            response = json.loads(response_line)
+            request_id = self._next_request_id()
+            future = connection.request("tools/list", request_id=request_id)
+            try:
+                response = future.result(timeout=STARTUP_TIMEOUT)
+            except FutureTimeoutError:
+                connection.cancel(request_id)
+                raise
 
             if "result" in response and "tools" in response["result"]:
                 tools = {}
@@ -222,6 +743,9 @@ class DynamicServerLoader:
                         "description": tool.get("description", ""),
                         "inputSchema": tool.get("inputSchema", {})
                     }
+                    if "outputSchema" in tool:
+                        tools[tool_name]["outputSchema"] = tool["outputSchema"]
+                    preprocess_tool(tool_name, tools[tool_name])
                 return tools
 
             return {}
@@ -247,118 +771,328 @@ class DynamicServerLoader:
         Returns:
             Tool execution result
         """
-        with self.lock:
-            # Load server if not already loaded
-            if server_name not in self.server_processes:
-                load_result = self.load_server(server_name)
-                if not load_result.get("success"):
-                    return load_result
+        self._touch(server_name)
+        cached = self._cached_result(server_name, tool_name, parameters)
+        if cached is not None:
+            return cached
 
-            # Get process
-            process = self.server_processes.get(server_name)
-            if not process:
-                return {
-                    "success": False,
-                    "error": f"Server '{server_name}' not loaded"
-                }
+        try:
+            with self._in_flight_semaphore(server_name):
+                result = self._call_tool(server_name, tool_name, parameters)
+        finally:
+            self._touch(server_name)
+        self._cache_result(server_name, tool_name, parameters, result)
+        return result
+
+    async def acall_tool(
+        self,
+        server_name: str,
+        tool_name: str,
+        parameters: Optional[Dict[str, Any]] = None
+    ) -> Dict:
+        """
+        Async variant of call_tool() that doesn't block the event loop.
 
-            # Check if process is still alive
-            if process.poll() is not None:
-                # Process died, remove from cache
-                del self.server_processes[server_name]
-                if server_name in self.server_tools:
-                    del self.server_tools[server_name]
+        The request is written from a worker thread, since a server that
+        stops reading its stdin would otherwise stall the loop, and the
+        response is awaited directly on the loop.
+
+        Args:
+            server_name: Name of the server
+            tool_name: Name of the tool to call
+            parameters: Tool parameters
+
+        Returns:
+            Tool execution result
+        """
+        self._touch(server_name)
+        cached = self._cached_result(server_name, tool_name, parameters)
+        if cached is not None:
+            return cached
+
+        semaphore = self._in_flight_semaphore(server_name)
+        await _acquire_slot(semaphore)
+        try:
+            if self.server_processes.get(server_name) is None:
+                connection, error = await asyncio.to_thread(self._connection_for, server_name)
+            else:
+                connection, error = self._connection_for(server_name)
+            if error:
+                return error
+
+            call_id = self._next_request_id()
+            try:
+                # The write blocks while the server isn't draining its stdin
+                future = await asyncio.to_thread(connection.call_tool, tool_name, parameters, call_id)
+                response = await asyncio.wait_for(asyncio.wrap_future(future), CALL_TIMEOUT)
+            except asyncio.TimeoutError:
+                connection.cancel(call_id)
+                return self._call_timed_out()
+            except asyncio.CancelledError:
+                connection.cancel(call_id)
+                raise
+            except Exception as e:
                 return {
                     "success": False,
-                    "error": f"Server '{server_name}' process terminated"
+                    "error": f"Failed to call tool: {str(e)}"
                 }
+            result = self._parse_call_response(response)
+        finally:
+            semaphore.release()
+            self._touch(server_name)
+        self._cache_result(server_name, tool_name, parameters, result)
+        return result
+
+    def _cache_ttl(self, server_name: str) -> float:
+        """Seconds results of a loaded server are cached ("cache_ttl", 0 = off)."""
+        server_config = self._resolved_configs.get(server_name)
+        if not server_config:
+            return 0.0
+        return float(server_config.get("cache_ttl", 0) or 0)
+
+    def _cached_result(
+        self,
+        server_name: str,
+        tool_name: str,
+        parameters: Optional[Dict[str, Any]]
+    ) -> Optional[Any]:
+        """Get a cached result for a call, or None if there is none."""
+        ttl = self._cache_ttl(server_name)
+        if ttl <= 0:
+            return None
+        return self._result_cache.get(compute_result_key(server_name, tool_name, parameters), ttl)
+
+    def _cache_result(
+        self,
+        server_name: str,
+        tool_name: str,
+        parameters: Optional[Dict[str, Any]],
+        result: Any
+    ):
+        """Cache a successful result if the server caches results."""
+        if isinstance(result, dict) and result.get("success") is False:
+            return
+        if self._cache_ttl(server_name) <= 0:
+            return
+        key = compute_result_key(server_name, tool_name, parameters)
+        self._result_cache.put(key, server_name, result)
+
+    def _track(self, server_name: str, server_config: Dict):
+        """Start idle tracking for a newly loaded server."""
+        timeout = float(server_config.get("idle_timeout_s", DEFAULT_IDLE_TIMEOUT) or 0)
+        with self._idle_lock:
+            idx = self._name_to_idx.get(server_name)
+            if idx is None:
+                self._name_to_idx[server_name] = len(self._names)
+                self._names.append(server_name)
+                self._last_used.append(time.monotonic())
+                self._idle_timeouts.append(timeout)
+            else:
+                self._last_used[idx] = time.monotonic()
+                self._idle_timeouts[idx] = timeout
+
+    def _untrack(self, server_name: str):
+        """Stop idle tracking for a server."""
+        with self._idle_lock:
+            idx = self._name_to_idx.pop(server_name, None)
+            if idx is None:
+                return
+
+            # Move the last slot into the freed one to keep the arrays packed
+            last = len(self._names) - 1
+            if idx != last:
+                moved = self._names[last]
+                self._names[idx] = moved
+                self._last_used[idx] = self._last_used[last]
+                self._idle_timeouts[idx] = self._idle_timeouts[last]
+                self._name_to_idx[moved] = idx
+            self._names.pop()
+            self._last_used.pop()
+            self._idle_timeouts.pop()
+
+    def _touch(self, server_name: str):
+        """Record activity on a server (no-op if it isn't loaded)."""
+        with self._idle_lock:
+            idx = self._name_to_idx.get(server_name)
+            if idx is not None:
+                self._last_used[idx] = time.monotonic()
+
+    def _in_flight_semaphore(self, server_name: str) -> threading.BoundedSemaphore:
+        """
+        Get the semaphore bounding concurrent calls to a server.
 
+        The bound comes from the server's "max_in_flight" key in .mcp.json
+        (default: DEFAULT_MAX_IN_FLIGHT).
+        """
+        with self.lock:
+            semaphore = self._in_flight.get(server_name)
+            if semaphore is None:
+                server_config = self._resolved_configs.get(server_name)
+                if server_config is None:
+                    server_config = self._load_config().get("mcpServers", {}).get(server_name) or {}
+                max_in_flight = server_config.get("max_in_flight", DEFAULT_MAX_IN_FLIGHT)
+                semaphore = threading.BoundedSemaphore(max(1, int(max_in_flight)))
+                self._in_flight[server_name] = semaphore
+            return semaphore
+
+    def _call_tool(
+        self,
+        server_name: str,
+        tool_name: str,
+        parameters: Optional[Dict[str, Any]]
+    ) -> Dict:
+        """Call a tool once a concurrency slot for the server is held."""
+        connection, error = self._connection_for(server_name)
+        if error:
+            return error
+
+        try:
+            # Call tool using MCP JSON-RPC protocol
+            call_id = self._next_request_id()
+            future = connection.call_tool(tool_name, parameters, call_id)
             try:
-                # Call tool using MCP JSON-RPC protocol
-                # Use incrementing ID to avoid conflicts
-                call_id = int(time.time() * 1000)  # millisecond timestamp as ID
-                request = {
-                    "jsonrpc": "2.0",
-                    "method": "tools/call",
-                    "params": {
-                        "name": tool_name,
-                        "arguments": parameters or {}
-                    },
-                    "id": call_id
-                }
+                response = future.result(timeout=CALL_TIMEOUT)
+            except FutureTimeoutError:
+                connection.cancel(call_id)
+                return self._call_timed_out()
+            return self._parse_call_response(response)
 
-                process.stdin.write(json.dumps(request) + "\n")
-                process.stdin.flush()
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Failed to call tool: {str(e)}"
+            }
 
-                # Read response with timeout using select
-                import select
-                ready, _, _ = select.select([process.stdout], [], [], 5.0)
+    def _connection_for(self, server_name: str) -> Tuple[Optional[McpConnection], Optional[Dict]]:
+        """
+        Get the connection to a server, loading and starting it if needed.
 
-                if not ready:
-                    return {
-                        "success": False,
-                        "error": "Tool call timed out after 5 seconds"
-                    }
+        Args:
+            server_name: Name of the server
 
-                response_line = process.stdout.readline()
-                if not response_line:
-                    return {
-                        "success": False,
-                        "error": "No response from server"
-                    }
+        Returns:
+            Tuple of (connection, None), or (None, error dict)
+        """
+        # Load server if not already loaded (outside the global lock)
+        if not self.is_server_loaded(server_name):
+            load_result = self.load_server(server_name)
+            if not load_result.get("success"):
+                return None, load_result
+
+        # Start the process if the server was loaded from the tool catalog
+        error = self._ensure_process(server_name)
+        if error:
+            return None, error
+
+        # Only the lookup holds the registry lock; the liveness check doesn't
+        with self.lock:
+            process = self.server_processes.get(server_name)
+            connection = self._connections.get(process) if process else None
+        if not process:
+            return None, {
+                "success": False,
+                "error": f"Server '{server_name}' not loaded"
+            }
 
-                response = json.loads(response_line)
-
-                if "result" in response:
-                    # MCP tools return: {"result": {"content": [{"type": "text", "text": "..."}]}}
-                    # Extract the actual content for easier use
-                    result = response["result"]
-
-                    # If result has content array, extract text from first content item
-                    if isinstance(result, dict) and "content" in result:
-                        content_items = result.get("content", [])
-                        if content_items and len(content_items) > 0:
-                            first_item = content_items[0]
-                            if isinstance(first_item, dict) and "text" in first_item:
-                                # Try to parse as JSON if it looks like JSON
-                                text = first_item["text"]
-                                try:
-                                    parsed = json.loads(text)
-                                    return parsed  # Return the parsed JSON directly
-                                except:
-                                    return {
-                                        "success": True,
-                                        "result": text  # Return as plain text
-                                    }
-
-                    # Fallback: return raw result
-                    return {
-                        "success": True,
-                        "result": result
-                    }
-                elif "error" in response:
-                    return {
-                        "success": False,
-                        "error": response["error"].get("message", "Unknown error")
-                    }
-                else:
-                    return {
-                        "success": False,
-                        "error": "Invalid response from server"
-                    }
+        # Check if process is still alive
+        if process.poll() is not None or connection is None or connection.closed:
+            self._forget_dead(server_name, process)
+            return None, {
+                "success": False,
+                "error": f"Server '{server_name}' process terminated"
+            }
 
-            except Exception as e:
-                return {
-                    "success": False,
-                    "error": f"Failed to call tool: {str(e)}"
-                }
+        return connection, None
+
+    def _forget_dead(self, server_name: str, process: subprocess.Popen):
+        """Remove a server whose process died (unless it was replaced meanwhile)."""
+        with self.lock:
+            if self.server_processes.get(server_name) is not process:
+                return
+            del self.server_processes[server_name]
+            if server_name in self.server_tools:
+                del self.server_tools[server_name]
+            instance_key = self._instance_keys.pop(server_name, None)
+            self._resolved_configs.pop(server_name, None)
+            if instance_key:
+                self._pool.discard(instance_key)
+            self._connections.pop(process, None)
+            self._untrack(server_name)
+            self._result_cache.invalidate(server_name)
+            self._notify(server_name)
+
+    def _next_request_id(self) -> int:
+        """JSON-RPC id for the next request (next() on a count is atomic)."""
+        return next(self._id_counter)
+
+    def _call_timed_out(self) -> Dict:
+        """Result returned when a tool call gets no response in time."""
+        return {
+            "success": False,
+            "error": f"Tool call timed out after {CALL_TIMEOUT:g} seconds"
+        }
+
+    def _parse_call_response(self, response: Dict) -> Dict:
+        """
+        Turn a tools/call response message into a tool result.
+
+        Args:
+            response: JSON-RPC response message
+
+        Returns:
+            Tool execution result
+        """
+        if "result" in response:
+            # MCP tools return: {"result": {"content": [{"type": "text", "text": "..."}]}}
+            # Extract the actual content for easier use
+            result = response["result"]
+
+            # If result has content array, extract text from first content item
+            if isinstance(result, dict) and "content" in result:
+                content_items = result.get("content", [])
+                if content_items and len(content_items) > 0:
+                    first_item = content_items[0]
+                    if isinstance(first_item, dict) and "text" in first_item:
+                        # Parse as JSON only if it looks like an object or array;
+                        # plain prose skips the parser entirely
+                        text = first_item["text"]
+                        stripped = text.lstrip()
+                        if stripped[:1] in ("{", "["):
+                            try:
+                                return loads(text)  # Return the parsed JSON directly
+                            except (ValueError, JSONDecodeError):
+                                pass
+                        return {
+                            "success": True,
+                            "result": text  # Return as plain text
+                        }
+
+            # Fallback: return raw result
+            return {
+                "success": True,
+                "result": result
+            }
+        elif "error" in response:
+            return {
+                "success": False,
+                "error": response["error"].get("message", "Unknown error")
+            }
+        else:
+            return {
+                "success": False,
+                "error": "Invalid response from server"
+            }
 
-    def unload_server(self, server_name: str) -> Dict:
+    def unload_server(self, server_name: str, wait: bool = True) -> Dict:
         """
         Unload a dynamically loaded server.
 
+        Its warm spares are stopped as well.
+
         Args:
             server_name: Name of the server to unload
+            wait: Wait for the process to exit (otherwise it is stopped on a
+                background thread)
 
         Returns:
             Unload status
@@ -370,68 +1104,150 @@ class DynamicServerLoader:
                     "error": f"Server '{server_name}' not loaded"
                 }
 
-            try:
-                process = self.server_processes[server_name]
-                process.terminate()
-                process.wait(timeout=5)
-
-                del self.server_processes[server_name]
-                if server_name in self.server_tools:
-                    del self.server_tools[server_name]
+            process = self.server_processes.pop(server_name)
+            instance_key = self._instance_keys.pop(server_name, None)
+            self._resolved_configs.pop(server_name, None)
+            self._untrack(server_name)
+            self._result_cache.invalidate(server_name)
+            if server_name in self.server_tools:
+                del self.server_tools[server_name]
+
+            # Shared instances are only stopped once their last user goes away
+            stop = process is not None and (
+                not instance_key or self._pool.release(instance_key) is not None
+            )
+            if stop:
+                self._connections.pop(process, None)
+            spares = self._spares.pop(server_name, [])
+            self._notify(server_name)
+
+        self._stop_spares(spares)
+        try:
+            # Wait for the process outside the registry lock
+            if stop and not wait:
+                threading.Thread(target=_stop_process, args=(process,), daemon=True).start()
+            elif stop:
+                _stop_process(process)
 
-                return {
-                    "success": True,
-                    "message": f"Server '{server_name}' unloaded successfully"
-                }
+            return {
+                "success": True,
+                "message": f"Server '{server_name}' unloaded successfully"
+            }
 
-            except Exception as e:
-                return {
-                    "success": False,
-                    "error": f"Failed to unload server: {str(e)}"
-                }
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Failed to unload server: {str(e)}"
+            }
 
     def reload_server(self, server_name: str) -> Dict:
         """
         Reload a server (unload then load).
 
+        If the server shares its process with other servers, all of them are
+        moved to the new process so the shared instance is really restarted.
+        Cached tools are discarded, so the new process is started right away.
+
+        If the server keeps warm spares ("warm_spares") and one was started
+        from the current config and command/script files, it replaces the old
+        process immediately and the old one is stopped in the background.
+
         Args:
             server_name: Name of the server to reload
 
         Returns:
             Reload status
         """
-        # Unload if loaded
-        if self.is_server_loaded(server_name):
-            unload_result = self.unload_server(server_name)
-            if not unload_result.get("success"):
-                return unload_result
-
-        # Load
-        return self.load_server(server_name)
+        with self.lock:
+            instance_key = self._instance_keys.get(server_name)
+            server_config = self._resolved_configs.get(server_name)
+            sharing = []
+            if instance_key:
+                sharing = [
+                    name for name, key in self._instance_keys.items()
+                    if key == instance_key and name != server_name
+                ]
+
+        fresh_config = self._load_config().get("mcpServers", {}).get(server_name)
+        spare = self._take_spare(server_name, fresh_config) if fresh_config else None
 
-    def get_loaded_servers(self) -> Dict:
+        # Unload if loaded
+        for name in [server_name] + sharing:
+            if self.is_server_loaded(name):
+                unload_result = self.unload_server(name, wait=spare is None)
+                if not unload_result.get("success"):
+                    if spare:
+                        self._stop_spares([(None, *spare)])
+                    return unload_result
+
+        # Re-discover the tools rather than serving them from the catalog
+        if server_config is None:
+            server_config = fresh_config
+        if server_config:
+            self._catalog.invalidate(compute_catalog_key(server_config))
+
+        # Load (not under the global lock: load_server takes per-server locks first)
+        if spare:
+            result = self._promote_spare(server_name, fresh_config, *spare)
+        else:
+            result = self.load_server(server_name)
+        for name in sharing:
+            self.load_server(name)
+        return result
+
+    def get_loaded_servers(self, cache_only: bool = False, force_rebuild: bool = False) -> Dict:
         """
         Get information about all loaded servers.
 
+        Args:
+            cache_only: Return the last snapshot without taking the lock or
+                probing processes (may report a stale status)
+            force_rebuild: Re-list the tools of every running server first
+
         Returns:
             Dictionary with loaded server information
         """
+        if force_rebuild:
+            with self.lock:
+                server_names = list(self.server_processes)
+            for server_name in server_names:
+                self.refresh_tools(server_name)
+        elif cache_only:
+            snapshot = self._loaded_snapshot
+            if snapshot is not None:
+                return {**snapshot, "cached": True}
+
+        # Copy the registry, then probe the processes without holding the lock
         with self.lock:
-            servers = []
-            for server_name, process in self.server_processes.items():
-                tools = self.server_tools.get(server_name, {})
-                servers.append({
-                    "name": server_name,
-                    "status": "running" if process.poll() is None else "terminated",
-                    "tools": list(tools.keys()),
-                    "tool_count": len(tools)
-                })
-
-            return {
-                "success": True,
-                "servers": servers,
-                "count": len(servers)
-            }
+            version = self._registry_version
+            loaded = [
+                (server_name, process, self.server_tools.get(server_name, {}))
+                for server_name, process in self.server_processes.items()
+            ]
+
+        servers = []
+        for server_name, process, tools in loaded:
+            servers.append({
+                "name": server_name,
+                "status": (
+                    "not started" if process is None
+                    else "running" if process.poll() is None
+                    else "terminated"
+                ),
+                "tools": list(tools.keys()),
+                "tool_count": len(tools)
+            })
+
+        snapshot = {
+            "success": True,
+            "servers": servers,
+            "count": len(servers)
+        }
+        with self.lock:
+            # Don't cache a listing that a concurrent change already outdated
+            if self._registry_version == version:
+                self._loaded_snapshot = snapshot
+        return snapshot
 
     def refresh_tools(self, server_name: str) -> Dict:
         """
@@ -443,6 +1259,19 @@ class DynamicServerLoader:
         Returns:
             Refreshed tool list
         """
+        # Tools served from the catalog are re-discovered by starting the process
+        if self.is_server_loaded(server_name) and self.server_processes.get(server_name) is None:
+            error = self._ensure_process(server_name)
+            if error:
+                return error
+            tools = self.server_tools.get(server_name, {})
+            return {
+                "success": True,
+                "server_name": server_name,
+                "tools": list(tools.keys()),
+                "tool_count": len(tools)
+            }
+
         with self.lock:
             if server_name not in self.server_processes:
                 return {
@@ -456,43 +1285,207 @@ class DynamicServerLoader:
                     "success": False,
                     "error": f"Server '{server_name}' process terminated"
                 }
-
-            try:
-                tools = self._discover_tools(process)
-                self.server_tools[server_name] = tools
-
+            connection = self._connections.get(process)
+            if connection is None:
                 return {
-                    "success": True,
-                    "server_name": server_name,
-                    "tools": list(tools.keys()),
-                    "tool_count": len(tools)
+                    "success": False,
+                    "error": f"Server '{server_name}' process terminated"
                 }
 
+        try:
+            # The session is already initialized; only re-list the tools
+            tools = self._discover_tools(connection, initialize=False)
+
+            with self.lock:
+                if self.server_processes.get(server_name) is not process:
+                    return {
+                        "success": False,
+                        "error": f"Server '{server_name}' was unloaded or restarted during refresh"
+                    }
+
+                # Servers sharing this instance see the refreshed tools too
+                instance_key = self._instance_keys.get(server_name)
+                sharing = [server_name]
+                if instance_key:
+                    self._pool.update_tools(instance_key, tools)
+                    sharing = [
+                        name for name, key in self._instance_keys.items()
+                        if key == instance_key
+                    ]
+                for name in sharing:
+                    self.server_tools[name] = tools
+                    self._notify(name)
+
+            return {
+                "success": True,
+                "server_name": server_name,
+                "tools": list(tools.keys()),
+                "tool_count": len(tools)
+            }
+
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Failed to refresh tools: {str(e)}"
+            }
+
+    def revalidate_tools(self):
+        """
+        Revalidate the tool lists of all loaded servers.
+
+        Fresh lists are left alone; stale ones are re-listed on a background
+        thread while the current list keeps being served.
+        """
+        for server_name, process in list(self.server_processes.items()):
+            if process is None:
+                # Catalog-served tools are re-checked when the process starts
+                continue
+            self._tools_swr.get(server_name, lambda name=server_name: self._fetch_tools(name))
+
+    def _fetch_tools(self, server_name: str) -> Dict[str, Dict]:
+        """Re-list a server's tools, raising if the server can't be reached."""
+        result = self.refresh_tools(server_name)
+        if not result.get("success"):
+            raise RuntimeError(result.get("error"))
+        return self.server_tools.get(server_name, {})
+
+    def start_idle_reaper(self, interval: float = IDLE_CHECK_INTERVAL):
+        """
+        Start a background thread that unloads idle servers.
+
+        A server is idle once no tool call touched it for its "idle_timeout_s"
+        (default: DEFAULT_IDLE_TIMEOUT). Reaped servers are transparently
+        started again by the next call_tool().
+
+        Args:
+            interval: Seconds between idle checks
+        """
+        if self._reaper is not None and self._reaper.is_alive():
+            return
+
+        self._reaper_stop.clear()
+        self._reaper = threading.Thread(
+            target=self._reap_idle_loop,
+            args=(interval,),
+            name="mcp-idle-reaper",
+            daemon=True
+        )
+        self._reaper.start()
+
+    def _reap_idle_loop(self, interval: float):
+        """Periodically unload idle servers until stopped."""
+        while not self._reaper_stop.wait(interval):
+            try:
+                self.reap_idle_servers()
             except Exception as e:
-                return {
-                    "success": False,
-                    "error": f"Failed to refresh tools: {str(e)}"
-                }
+                print(f"Warning: idle reaper failed: {e}", file=sys.stderr)
+
+    def reap_idle_servers(self) -> List[str]:
+        """
+        Unload servers that have been idle longer than their timeout.
+
+        Returns:
+            Names of the servers that were unloaded
+        """
+        now = time.monotonic()
+        with self._idle_lock:
+            idle = [
+                name
+                for name, last_used, timeout in zip(self._names, self._last_used, self._idle_timeouts)
+                if timeout and now - last_used >= timeout
+            ]
+
+        reaped = []
+        for server_name in idle:
+            if self.unload_server(server_name).get("success"):
+                reaped.append(server_name)
+
+        return reaped
 
     def cleanup(self):
         """Cleanup all loaded servers."""
+        self._reaper_stop.set()
         with self.lock:
-            for server_name in list(self.server_processes.keys()):
-                try:
-                    process = self.server_processes[server_name]
-                    process.terminate()
-                    process.wait(timeout=5)
-                except:
-                    pass
-
+            # Shared instances appear under several names; stop each process once
+            processes = {id(p): p for p in self.server_processes.values() if p is not None}
+            for spares in self._spares.values():
+                processes.update((id(p), p) for _, p, _ in spares)
+            self._spares.clear()
+            server_names = list(self.server_tools.keys())
             self.server_processes.clear()
             self.server_tools.clear()
+            self._instance_keys.clear()
+            self._resolved_configs.clear()
+            self._pool.clear()
+            self._connections.clear()
+            self._result_cache.invalidate()
+            with self._idle_lock:
+                self._names.clear()
+                self._name_to_idx.clear()
+                del self._last_used[:]
+                del self._idle_timeouts[:]
+
+        # Outside the registry lock: signal every process first, then wait for
+        # all of them against one deadline and kill the ones still running
+        for process in processes.values():
+            try:
+                process.terminate()
+            except OSError:
+                pass
+        deadline = time.monotonic() + CLEANUP_TIMEOUT
+        stragglers = []
+        for process in processes.values():
+            try:
+                process.wait(timeout=max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                process.kill()
+                stragglers.append(process)
+        for process in stragglers:
+            try:
+                process.wait(timeout=STOP_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                pass
+
+        # Listeners run last, so one failing (e.g. at interpreter exit) can't
+        # leave processes running
+        with self.lock:
+            for server_name in server_names:
+                self._notify(server_name)
 
-    def __del__(self):
-        """Cleanup on destruction."""
+    def __enter__(self) -> "DynamicServerLoader":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
         self.cleanup()
 
 
+async def _acquire_slot(semaphore: threading.BoundedSemaphore):
+    """
+    Take an in-flight slot without blocking the event loop.
+
+    The semaphore is shared with threaded callers, so it is polled rather
+    than waited on from a worker thread: a cancelled waiter never ends up
+    holding a slot, and waiting ties up no thread.
+    """
+    delay = 0.001
+    while not semaphore.acquire(blocking=False):
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, IN_FLIGHT_POLL_MAX)
+
+
+def _stop_process(process: subprocess.Popen):
+    """Terminate a process, killing it if it doesn't exit within STOP_TIMEOUT."""
+    try:
+        process.terminate()
+        try:
+            process.wait(timeout=STOP_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait(timeout=STOP_TIMEOUT)
+    except Exception:
+        pass
+
+
 # Global instance
 _loader = None
 
@@ -502,4 +1495,7 @@ def get_loader() -> DynamicServerLoader:
     global _loader
     if _loader is None:
         _loader = DynamicServerLoader()
+        _loader.start_idle_reaper()
+        # Stop the servers at interpreter exit (bounded by CLEANUP_TIMEOUT)
+        atexit.register(_loader.cleanup)
     return _loader
@@ -0,0 +1,85 @@
+"""
+MCP Config Reader
+
+Shared, memoized reader for .mcp.json. Parsed configs are cached per path and
+validated against the file's mtime and size, so repeated reads of an unchanged
+file skip the open + JSON parse entirely. Parsing uses orjson when available.
+"""
+
+import threading
+from pathlib import Path
+from typing import Dict, Tuple
+
+from .fast_json import loads
+from .swr_cache import SWRCache
+
+# Listing paths may serve a slightly stale config while it is re-read in the background
+_swr = SWRCache(ttl_fresh=2.0, ttl_stale=60.0)
+
+# path -> ((mtime_ns, size), parsed config). One entry per file, so the loader's
+# and the installer's configs don't evict each other.
+_cache: Dict[str, Tuple[Tuple[int, int], Dict]] = {}
+_cache_lock = threading.Lock()
+
+
+def load_config(config_file: Path, allow_stale: bool = False) -> Dict:
+    """
+    Load a .mcp.json configuration, reusing the cached parse when unchanged.
+
+    The returned dict is shared between callers and must not be mutated;
+    copy it first if you intend to modify and save it.
+
+    Args:
+        config_file: Path to the .mcp.json file
+        allow_stale: Serve a recently read config without checking the file,
+            revalidating it in the background (for listing paths only)
+
+    Returns:
+        Parsed configuration (empty server map if the file does not exist)
+    """
+    if allow_stale:
+        return _swr.get(str(config_file), lambda: _load_fresh(config_file))
+    return _load_fresh(config_file)
+
+
+def _load_fresh(config_file: Path) -> Dict:
+    """Load a config, checking the file's mtime and size first."""
+    path = str(config_file)
+    try:
+        st = config_file.stat()
+    except FileNotFoundError:
+        return {"mcpServers": {}}
+
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    with open(path, 'rb') as f:
+        config = loads(f.read())
+    with _cache_lock:
+        _cache[path] = (stamp, config)
+    return config
+
+
+def cache_saved_config(config_file: Path, config: Dict):
+    """
+    Cache a config that was just written, so the next load skips re-reading it.
+
+    The config becomes shared between callers and must not be mutated
+    afterwards.
+
+    Args:
+        config_file: Path the config was written to
+        config: The config as written
+    """
+    path = str(config_file)
+    try:
+        st = config_file.stat()
+    except OSError:
+        with _cache_lock:
+            _cache.pop(path, None)
+    else:
+        with _cache_lock:
+            _cache[path] = ((st.st_mtime_ns, st.st_size), config)
+    _swr.invalidate(path)
@@ -0,0 +1,372 @@
+"""
+MCP Connection - JSON-RPC session over a server process's stdio
+
+A reader thread owns the process's stdout and resolves a Future per request
+as the matching response arrives, so callers can wait on responses either by
+blocking (future.result()) or from asyncio (asyncio.wrap_future()) without
+holding a thread per waiter.
+
+Requests are pipelined: they are written as soon as they are made, and
+responses (which may arrive in any order) are matched to their requests by
+JSON-RPC id. Ids must therefore be unique among a connection's pending
+requests.
+
+Both pipes are used through their raw file descriptors: requests go out in a
+single os.write() and responses are split out of large os.read() chunks, so
+messages never pass through the file objects' buffers.
+
+If the process's stderr is a pipe, a second thread drains it so the server
+can never block on a full pipe, keeping the last lines for diagnostics.
+
+Very large tool results are decoded with ijson (when installed with its C
+backend), which extracts just the first text content item instead of
+building the whole message, e.g. a duplicate structuredContent tree.
+"""
+
+import functools
+import io
+import os
+import subprocess
+import threading
+from collections import deque
+from concurrent.futures import Future, InvalidStateError
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from .fast_json import dumpb, loads
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - ijson is optional
+    ijson = None
+
+
+# Bytes requested from stdout per os.read()
+READ_SIZE = 65536
+
+# Number of trailing stderr lines kept for error messages
+STDERR_TAIL_LINES = 20
+
+# Messages at least this large (bytes) are decoded with ijson if possible
+STREAMING_THRESHOLD = 1 << 20
+
+# The pure-Python ijson backend is slower than a full orjson parse
+_STREAMING = ijson is not None and ijson.backend.startswith("yajl2_c")
+
+
+class McpConnection:
+    """JSON-RPC client over the stdin/stdout pipes of an MCP server process."""
+
+    def __init__(self, process: subprocess.Popen):
+        """
+        Start reading responses from a server process.
+
+        Args:
+            process: Server subprocess with binary stdin/stdout pipes (and
+                optionally a stderr pipe)
+        """
+        self.process = process
+        self.lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._pending: Dict[Any, Future] = {}  # request id -> future of the response
+        self._error: Optional[Exception] = None  # set once the connection is closed
+        self._stderr_tail = deque(maxlen=STDERR_TAIL_LINES)
+
+        self._reader = threading.Thread(
+            target=self._read_loop,
+            name=f"mcp-reader-{process.pid}",
+            daemon=True
+        )
+        self._reader.start()
+
+        self._stderr_reader = None
+        if process.stderr is not None:
+            self._stderr_reader = threading.Thread(
+                target=self._drain_stderr,
+                name=f"mcp-stderr-{process.pid}",
+                daemon=True
+            )
+            self._stderr_reader.start()
+
+    @property
+    def closed(self) -> bool:
+        """True once the server closed its stdout."""
+        return self._error is not None
+
+    def stderr_tail(self, wait: float = 0.0) -> List[str]:
+        """
+        Get the last lines the server wrote to stderr.
+
+        Args:
+            wait: Seconds to wait for the stderr pipe to reach EOF first
+                (useful right after the process exited)
+
+        Returns:
+            Up to STDERR_TAIL_LINES lines, oldest first
+        """
+        if wait and self._stderr_reader is not None:
+            self._stderr_reader.join(wait)
+        return list(self._stderr_tail)
+
+    def request(
+        self,
+        method: str,
+        params: Optional[Union[Dict, bytes]] = None,
+        request_id: Any = None
+    ) -> Future:
+        """
+        Send a JSON-RPC request.
+
+        Args:
+            method: JSON-RPC method, e.g. "tools/call"
+            params: Request params, or params already encoded as JSON bytes
+                (omitted if None)
+            request_id: Id of the request, unique among pending requests
+
+        Returns:
+            Future resolved with the response message, or failed with
+            ConnectionError if the server goes away first
+
+        Raises:
+            ValueError: If a request with the same id is still pending
+        """
+        if params is None:
+            line = b"".join((_method_prefix(method), _encode_id(request_id), b"}\n"))
+        else:
+            if not isinstance(params, bytes):
+                params = dumpb(params)
+            line = b"".join((
+                _method_prefix(method), _encode_id(request_id), b',"params":', params, b"}\n"
+            ))
+        return self._send(request_id, line)
+
+    def call_tool(self, tool_name: str, arguments: Optional[Dict], request_id: Any) -> Future:
+        """
+        Send a tools/call request.
+
+        Only the tool name and arguments are serialized; the framing around
+        them is constant.
+
+        Args:
+            tool_name: Name of the tool
+            arguments: Tool arguments
+            request_id: Id of the request, unique among pending requests
+
+        Returns:
+            Future of the response, as for request()
+        """
+        line = b"".join((
+            _TOOLS_CALL_PREFIX, _encode_id(request_id),
+            b',"params":{"name":', dumpb(tool_name),
+            b',"arguments":', dumpb(arguments or {}), b"}}\n"
+        ))
+        return self._send(request_id, line)
+
+    def _send(self, request_id: Any, line: bytes) -> Future:
+        """Register a pending request and write its encoded line."""
+        future = Future()
+        with self.lock:
+            if self._error is not None:
+                future.set_exception(self._error)
+                return future
+            if request_id in self._pending:
+                raise ValueError(f"Request id {request_id!r} is already pending")
+            self._pending[request_id] = future
+
+        # Only stdin is serialized; responses are awaited concurrently
+        self._write(request_id, line)
+        return future
+
+    def notify(self, method: str, params: Optional[Dict] = None):
+        """
+        Send a JSON-RPC notification (no response expected).
+
+        Args:
+            method: Notification method, e.g. "notifications/initialized"
+            params: Notification params (omitted if None)
+        """
+        message = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        self._write(None, dumpb(message) + b"\n")
+
+    def cancel(self, request_id: Any):
+        """
+        Stop waiting for a request (e.g. after a timeout).
+
+        A late response to it is discarded.
+
+        Args:
+            request_id: Id passed to request()
+        """
+        with self.lock:
+            future = self._pending.pop(request_id, None)
+        if future is not None:
+            future.cancel()
+
+    def _write(self, request_id: Any, line: bytes):
+        """Write a line to the server's stdin, failing the request on error."""
+        try:
+            with self._write_lock:
+                fd = self.process.stdin.fileno()
+                view = memoryview(line)
+                while view:
+                    view = view[os.write(fd, view):]
+        except (OSError, ValueError) as e:
+            error = ConnectionError(f"Failed to write to server: {e}")
+            if request_id is None:
+                raise error from e
+            with self.lock:
+                future = self._pending.pop(request_id, None)
+            if future is not None:
+                _resolve(future, exception=error)
+
+    def _read_loop(self):
+        """Dispatch responses from stdout to their futures until EOF."""
+        try:
+            for line in self._read_lines():
+                try:
+                    message = _decode(line)
+                except ValueError:
+                    continue  # not JSON-RPC (e.g. stray log output)
+
+                # Only responses carry result/error; server requests and
+                # notifications are ignored
+                if not isinstance(message, dict) or "id" not in message:
+                    continue
+                if "result" not in message and "error" not in message:
+                    continue
+
+                with self.lock:
+                    future = self._pending.pop(message["id"], None)
+                # None for late responses to requests that were given up on
+                if future is not None:
+                    _resolve(future, result=message)
+        except (OSError, ValueError):
+            pass  # stdout closed underneath us
+        finally:
+            # Even if the loop died unexpectedly, waiters must not hang
+            self._close()
+
+    def _read_lines(self) -> Iterator[bytes]:
+        """Yield the lines the server writes to stdout until EOF."""
+        fd = self.process.stdout.fileno()
+        buffer = bytearray()
+        while True:
+            chunk = os.read(fd, READ_SIZE)
+            if not chunk:
+                return  # a partial last line is never a complete message
+
+            # Only scan the new bytes; the buffer holds no newline yet
+            scan = len(buffer)
+            buffer += chunk
+            start = 0
+            end = buffer.find(b"\n", scan)
+            while end >= 0:
+                yield bytes(buffer[start:end])
+                start = end + 1
+                end = buffer.find(b"\n", start)
+            if start:
+                del buffer[:start]
+
+    def _drain_stderr(self):
+        """Keep reading stderr so the server never blocks on it."""
+        try:
+            for line in self.process.stderr:
+                self._stderr_tail.append(line.decode("utf-8", "replace").rstrip())
+        except (OSError, ValueError):
+            pass  # stderr closed underneath us
+
+    def _close(self):
+        """Fail everything still pending once the server stopped answering."""
+        try:
+            returncode = self.process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            returncode = None
+        error = ConnectionError(f"Server closed the connection (exit code {returncode})")
+
+        with self.lock:
+            self._error = error
+            pending = list(self._pending.values())
+            self._pending.clear()
+
+        for future in pending:
+            _resolve(future, exception=error)
+
+
+@functools.lru_cache(maxsize=None)
+def _method_prefix(method: str) -> bytes:
+    """Constant start of a request for a method, up to the id value."""
+    return b'{"jsonrpc":"2.0","method":' + dumpb(method) + b',"id":'
+
+
+_TOOLS_CALL_PREFIX = _method_prefix("tools/call")
+
+
+def _encode_id(request_id: Any) -> bytes:
+    """Encode a request id (usually an int) as JSON."""
+    if type(request_id) is int:
+        return b"%d" % request_id
+    return dumpb(request_id)
+
+
+def _decode(line: bytes) -> Any:
+    """Decode a message, streaming large tool results."""
+    if _STREAMING and len(line) >= STREAMING_THRESHOLD:
+        try:
+            message = _decode_tool_result(line)
+        except ijson.JSONError:
+            message = None  # not JSON; loads() raises the usual ValueError
+        if message is not None:
+            return message
+    return loads(line)
+
+
+def _decode_tool_result(line: bytes) -> Optional[Dict]:
+    """
+    Decode only the parts of a tools/call result the loader uses.
+
+    Args:
+        line: Raw JSON-RPC message
+
+    Returns:
+        A response carrying the id and the first content item's text, or
+        None if the message isn't a result whose first content item is text
+    """
+    request_id = None
+    text = None
+    is_error = False
+    items = 0
+
+    for prefix, event, value in ijson.parse(io.BytesIO(line)):
+        if prefix == "id" and event in ("number", "string"):
+            request_id = value
+        elif prefix == "error":
+            return None
+        elif prefix == "result.content.item" and event == "start_map":
+            items += 1
+        elif prefix == "result.content.item.text" and items == 1 and event == "string":
+            text = value
+        elif prefix == "result.isError" and event == "boolean":
+            is_error = value
+
+    if request_id is None or text is None:
+        return None
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "result": {
+            "content": [{"type": "text", "text": text}],
+            "isError": is_error
+        }
+    }
+
+
+def _resolve(future: Future, result: Any = None, exception: Optional[Exception] = None):
+    """Complete a future unless its waiter already gave up on it."""
+    try:
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+    except InvalidStateError:
+        pass  # cancelled
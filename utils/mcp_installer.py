@@ -5,32 +5,113 @@ Install MCP servers from git repositories and automatically configure them in .m
 Supports public and private repositories, dependency installation, and environment configuration.
 """
 
+import ast
+import asyncio
+import copy
+import functools
 import json
 import os
-import subprocess
+import re
+import shutil
 import sys
+import tempfile
+import threading
+from collections import deque
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 from urllib.parse import urlparse
 
+from .mcp_config import cache_saved_config, load_config
+
+try:
+    import pygit2
+except ImportError:  # pragma: no cover - pygit2 is optional
+    pygit2 = None
+
+# url@branch syntax (not applied to scp-style git@host:... URLs)
+_GIT_REF = re.compile(r"^(?!git@)(?P<url>.+)@(?P<ref>[^@]+)$")
+
+# Serializes .mcp.json read-modify-write cycles. Module-level because the
+# proxy creates an installer per request.
+_config_lock = threading.Lock()
+
+# Trailing stderr lines of a git/pip run kept for error messages
+STDERR_TAIL_LINES = 200
+
+# Ref that in-process (libgit2) updates fetch the new commit into
+_UPDATE_REF = "refs/mcp-proxy/update"
+
+# Importing one of these packages marks a file as an MCP server
+_MCP_PACKAGES = frozenset(("mcp", "fastmcp"))
+
+# Byte-level fallback for files whose head doesn't parse: "fastmcp" in any
+# case, or "from mcp"
+_MCP_IMPORT_RE = re.compile(rb"(?i:fastmcp)|from mcp")
+
+# Bytes read from the start of each file when looking for those imports
+IMPORT_SCAN_BYTES = 4096
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_git_url(url: str) -> Tuple[str, Optional[str]]:
+    """Parse a git URL into (repo_name, branch/tag). Memoized."""
+    # Handle branch/tag syntax: url@branch
+    match = _GIT_REF.match(url)
+    if match:
+        url, ref = match.group("url"), match.group("ref")
+    else:
+        ref = None
+
+    # Extract repository name
+    parsed = urlparse(url)
+    path = parsed.path.rstrip('/')
+    repo_name = Path(path).stem.replace('.git', '')
+
+    return repo_name, ref
+
 
 class MCPInstaller:
     """Install and configure MCP servers from git repositories."""
 
-    def __init__(self, mcp_dir: Optional[Path] = None, config_file: Optional[Path] = None):
+    def __init__(
+        self,
+        mcp_dir: Optional[Path] = None,
+        config_file: Optional[Path] = None,
+        verbose: bool = False
+    ):
         """
         Initialize the MCP installer.
 
         Args:
             mcp_dir: Directory to install MCP servers (default: ~/.mcp_servers)
             config_file: Path to .mcp.json config file (default: ./.mcp.json)
+            verbose: Show the output of git and pip instead of discarding it
         """
         self.mcp_dir = mcp_dir or Path.home() / ".mcp_servers"
         self.mcp_dir.mkdir(parents=True, exist_ok=True)
-
         self.config_file = config_file or Path.cwd() / ".mcp.json"
+        self.verbose = verbose
         self.venv_python = self._find_venv_python()
 
+        # Resolved once instead of on every command
+        self._git = shutil.which("git") or "git"
+        # Dependencies are installed with uv's resolver when it is available
+        self._uv = shutil.which("uv")
+
+        # Wheel and HTTP cache of pip (or uv), kept next to the servers so it
+        # survives environments without a persistent user cache
+        self.cache_dir = self.mcp_dir / (".uv-cache" if self._uv else ".pip-cache")
+        self.cache_dir.mkdir(exist_ok=True)
+
+        # Environment for git and pip: never prompt for credentials, which
+        # would stall (batch) installs instead of failing them, and skip pip's
+        # PyPI round trip for its self-version check
+        self._subprocess_env = {
+            **os.environ,
+            "GIT_TERMINAL_PROMPT": "0",
+            "PIP_DISABLE_PIP_VERSION_CHECK": "1",
+        }
+
     def _find_venv_python(self) -> str:
         """Find the Python executable in the current virtual environment."""
         # Check if we're in a venv
@@ -48,16 +129,31 @@ class MCPInstaller:
         return sys.executable
 
     def _load_config(self) -> Dict:
-        """Load existing .mcp.json configuration."""
-        if self.config_file.exists():
-            with open(self.config_file, 'r') as f:
-                return json.load(f)
-        return {"mcpServers": {}}
+        """Load existing .mcp.json configuration (cached, do not mutate)."""
+        return load_config(self.config_file)
 
     def _save_config(self, config: Dict):
-        """Save .mcp.json configuration."""
-        with open(self.config_file, 'w') as f:
-            json.dump(config, f, indent=2)
+        """
+        Atomically replace .mcp.json. Caller must hold _config_lock.
+
+        The config is serialized once and written to a temporary file in the
+        same directory, so readers see either the old or the new file.
+        """
+        data = json.dumps(config, indent=2).encode("utf-8")
+        target = self.config_file.resolve()  # replace a symlink's target, not the link
+        fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=target.name, suffix=".tmp")
+        try:
+            try:
+                os.fchmod(fd, os.stat(target).st_mode & 0o777)
+            except FileNotFoundError:
+                os.fchmod(fd, 0o644)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, target)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        cache_saved_config(self.config_file, config)
         print(f"✓ Updated {self.config_file}")
 
     def _parse_git_url(self, url: str) -> tuple[str, Optional[str]]:
@@ -70,18 +166,47 @@ class MCPInstaller:
         Returns:
             Tuple of (repo_name, branch/tag)
         """
-        # Handle branch/tag syntax: url@branch
-        if '@' in url and not url.startswith('git@'):
-            url, ref = url.rsplit('@', 1)
-        else:
-            ref = None
+        return _parse_git_url(url)
 
-        # Extract repository name
-        parsed = urlparse(url)
-        path = parsed.path.rstrip('/')
-        repo_name = Path(path).stem.replace('.git', '')
+    async def _run(self, cmd: List[str]) -> Tuple[int, str]:
+        """
+        Run a command without blocking the event loop.
+
+        Only stderr is captured (it is what gets reported on failure); stdout
+        is discarded, or passed through in verbose mode. stderr is streamed
+        rather than buffered whole: only its last STDERR_TAIL_LINES lines are
+        kept, and in verbose mode it is echoed as it arrives.
 
-        return repo_name, ref
+        Args:
+            cmd: Command and arguments
+
+        Returns:
+            Tuple of (returncode, stderr)
+        """
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=None if self.verbose else asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+            env=self._subprocess_env
+        )
+        tail = deque(maxlen=STDERR_TAIL_LINES)
+        partial = b""
+        while True:
+            chunk = await process.stderr.read(65536)
+            if not chunk:
+                break
+            if self.verbose:
+                sys.stderr.write(chunk.decode(errors="replace"))
+                sys.stderr.flush()
+            lines = (partial + chunk).split(b"\n")
+            partial = lines.pop()[-65536:]
+            tail.extend(lines)
+        if partial:
+            tail.append(partial)
+
+        returncode = await process.wait()
+        return returncode, b"\n".join(tail).decode(errors="replace")
 
     def install_from_git(
         self,
@@ -90,11 +215,61 @@ class MCPInstaller:
         server_file: Optional[str] = None,
         env_vars: Optional[Dict[str, str]] = None,
         requirements_file: Optional[str] = None,
-        auto_detect: bool = True
-    ) -> bool:
+        auto_detect: bool = True,
+        shallow: bool = True
+    ) -> Tuple[bool, str]:
+        """
+        Install an MCP server from a git repository.
+
+        Blocking wrapper around ainstall_from_git() for synchronous callers
+        (e.g. the CLI). Must not be called from a running event loop.
+
+        Args:
+            git_url: Git repository URL (can include @branch)
+            server_name: Name for the server in .mcp.json (default: repo name)
+            server_file: Python file to run (default: auto-detect)
+            env_vars: Environment variables to pass to the server
+            requirements_file: Path to requirements file (default: requirements.txt)
+            auto_detect: Auto-detect server file if not specified
+            shallow: Clone/update only the latest commit (see ainstall_from_git())
+
+        Returns:
+            Tuple of (success, server_name) where server_name is the name
+            the server was (or would have been) registered under
+        """
+        return asyncio.run(self.ainstall_from_git(
+            git_url=git_url,
+            server_name=server_name,
+            server_file=server_file,
+            env_vars=env_vars,
+            requirements_file=requirements_file,
+            auto_detect=auto_detect,
+            shallow=shallow
+        ))
+
+    async def ainstall_from_git(
+        self,
+        git_url: str,
+        server_name: Optional[str] = None,
+        server_file: Optional[str] = None,
+        env_vars: Optional[Dict[str, str]] = None,
+        requirements_file: Optional[str] = None,
+        auto_detect: bool = True,
+        shallow: bool = True
+    ) -> Tuple[bool, str]:
         """
         Install an MCP server from a git repository.
 
+        git and pip run as async subprocesses, so concurrent installs overlap
+        their network and dependency work.
+
+        By default the repository is cloned shallow (latest commit of a single
+        branch, blobs fetched on checkout only), and an existing checkout is
+        updated by fetching that commit and resetting to it, discarding local
+        changes. History-based git commands such as bisect or merge-base won't
+        work in such checkouts; pass shallow=False for a full clone and a
+        plain git pull.
+
         Args:
             git_url: Git repository URL (can include @branch)
             server_name: Name for the server in .mcp.json (default: repo name)
@@ -102,43 +277,207 @@ class MCPInstaller:
             env_vars: Environment variables to pass to the server
             requirements_file: Path to requirements file (default: requirements.txt)
             auto_detect: Auto-detect server file if not specified
+            shallow: Clone/update only the latest commit
 
         Returns:
-            True if installation succeeded, False otherwise
+            Tuple of (success, server_name) where server_name is the name
+            the server was (or would have been) registered under
         """
         print(f"Installing MCP server from {git_url}...")
 
         # Parse git URL
-        repo_name, ref = self._parse_git_url(git_url)
+        repo_name, _ = self._parse_git_url(git_url)
         server_name = server_name or repo_name
 
         # Clone repository
+        install_path = await self._fetch_repo(git_url, shallow)
+        if install_path is None:
+            return False, server_name
+
+        # Install dependencies
+        if not await self._install_dependencies(install_path, requirements_file):
+            return False, server_name
+
+        success = self._register_server(install_path, server_name, server_file, env_vars, auto_detect)
+        return success, server_name
+
+    def install_many(self, specs: List[Dict], workers: int = 4) -> List[Tuple[bool, str]]:
+        """
+        Install several MCP servers.
+
+        Blocking wrapper around ainstall_many() for synchronous callers.
+
+        Args:
+            specs: Keyword arguments of install_from_git() per server
+            workers: Maximum number of repositories fetched at the same time
+
+        Returns:
+            (success, server_name) per spec, in order
+        """
+        return asyncio.run(self.ainstall_many(specs, workers=workers))
+
+    async def ainstall_many(self, specs: List[Dict], workers: int = 4) -> List[Tuple[bool, str]]:
+        """
+        Install several MCP servers.
+
+        The repositories are cloned (or updated) concurrently, at most
+        `workers` at a time; specs resolving to the same checkout directory
+        share one fetch. The dependencies of all servers are then installed
+        in a single pip run, falling back to one run per server if they
+        can't be resolved together.
+
+        Args:
+            specs: Keyword arguments of ainstall_from_git() per server; each
+                needs at least "git_url"
+            workers: Maximum number of repositories fetched at the same time
+
+        Returns:
+            (success, server_name) per spec, in order
+        """
+        semaphore = asyncio.Semaphore(max(1, workers))
+        fetches = {}  # repo name -> task, so each checkout is fetched once
+
+        async def fetch(git_url: str, shallow: bool) -> Optional[Path]:
+            async with semaphore:
+                try:
+                    return await self._fetch_repo(git_url, shallow)
+                except Exception as e:
+                    # e.g. git missing; only the specs of this repository fail
+                    print(f"✗ Failed to fetch {git_url}: {e}")
+                    return None
+
+        for spec in specs:
+            repo_name, _ = self._parse_git_url(spec["git_url"])
+            if repo_name not in fetches:
+                fetches[repo_name] = asyncio.ensure_future(
+                    fetch(spec["git_url"], spec.get("shallow", True))
+                )
+
+        total = len(fetches)
+        for done, task in enumerate(asyncio.as_completed(fetches.values()), 1):
+            await task
+            print(f"[{done}/{total}] repositories fetched")
+
+        req_paths = []
+        for spec in specs:
+            install_path = fetches[self._parse_git_url(spec["git_url"])[0]].result()
+            if install_path is not None:
+                req_path = install_path / (spec.get("requirements_file") or "requirements.txt")
+                if req_path.exists() and req_path not in req_paths:
+                    req_paths.append(req_path)
+        bulk_installed = bool(req_paths) and await self._install_dependencies_bulk(req_paths)
+
+        results = []
+        for spec in specs:
+            repo_name, _ = self._parse_git_url(spec["git_url"])
+            server_name = spec.get("server_name") or repo_name
+            install_path = fetches[repo_name].result()
+
+            success = (
+                install_path is not None
+                and (bulk_installed
+                     or await self._install_dependencies(install_path, spec.get("requirements_file")))
+                and self._register_server(
+                    install_path,
+                    server_name,
+                    spec.get("server_file"),
+                    spec.get("env_vars"),
+                    spec.get("auto_detect", True)
+                )
+            )
+            results.append((bool(success), server_name))
+
+        return results
+
+    async def _fetch_repo(self, git_url: str, shallow: bool = True) -> Optional[Path]:
+        """
+        Clone a repository into mcp_dir, or update an existing checkout.
+
+        Shallow fetches go through libgit2 in-process when pygit2 is
+        installed, avoiding a git process per operation. Anything libgit2
+        can't handle (e.g. credentials from git's helpers, tags as the ref)
+        falls back to the git command line.
+
+        Args:
+            git_url: Git repository URL (can include @branch)
+            shallow: Clone/update only the latest commit
+
+        Returns:
+            Path of the checkout, or None on failure
+        """
+        repo_name, ref = self._parse_git_url(git_url)
         install_path = self.mcp_dir / repo_name
-        if install_path.exists():
+        existed = install_path.exists()
+        if existed:
             print(f"⚠ Directory {install_path} already exists. Updating...")
-            result = subprocess.run(
-                ["git", "-C", str(install_path), "pull"],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode != 0:
-                print(f"✗ Failed to update repository: {result.stderr}")
-                return False
+
+        if shallow and pygit2 is not None:
+            try:
+                await asyncio.to_thread(self._fetch_repo_libgit2, git_url, install_path, ref, existed)
+                if not existed:
+                    print(f"✓ Cloned {repo_name} to {install_path}")
+                return install_path
+            except Exception as e:
+                print(f"ℹ libgit2 fetch failed ({e}), retrying with git")
+                if not existed:
+                    shutil.rmtree(install_path, ignore_errors=True)
+
+        if existed:
+            if shallow:
+                returncode, stderr = await self._run(
+                    [self._git, "-C", str(install_path), "fetch", "--depth=1", "origin", ref or "HEAD"]
+                )
+                if returncode == 0:
+                    returncode, stderr = await self._run(
+                        [self._git, "-C", str(install_path), "reset", "--hard", "FETCH_HEAD"]
+                    )
+            else:
+                returncode, stderr = await self._run([self._git, "-C", str(install_path), "pull"])
+            if returncode != 0:
+                print(f"✗ Failed to update repository: {stderr}")
+                return None
         else:
-            clone_cmd = ["git", "clone", git_url, str(install_path)]
+            clone_cmd = [self._git, "clone"]
+            if shallow:
+                # Shallow, blob-less clone: we only need a working tree to run the server
+                clone_cmd.extend(["--depth=1", "--single-branch", "--filter=blob:none"])
             if ref:
                 clone_cmd.extend(["--branch", ref])
+            clone_cmd.extend([git_url, str(install_path)])
 
-            result = subprocess.run(clone_cmd, capture_output=True, text=True)
-            if result.returncode != 0:
-                print(f"✗ Failed to clone repository: {result.stderr}")
-                return False
+            returncode, stderr = await self._run(clone_cmd)
+            if returncode != 0:
+                print(f"✗ Failed to clone repository: {stderr}")
+                return None
             print(f"✓ Cloned {repo_name} to {install_path}")
 
-        # Install dependencies
-        if not self._install_dependencies(install_path, requirements_file):
-            return False
+        return install_path
+
+    def _fetch_repo_libgit2(self, git_url: str, install_path: Path, ref: Optional[str], update: bool):
+        """
+        Shallow clone or update a repository with pygit2 (blocking).
 
+        Raises:
+            Exception: Any pygit2 error; the caller falls back to git
+        """
+        if not update:
+            pygit2.clone_repository(git_url, str(install_path), checkout_branch=ref, depth=1)
+            return
+
+        repo = pygit2.Repository(str(install_path))
+        repo.remotes["origin"].fetch([f"+{ref or 'HEAD'}:{_UPDATE_REF}"], depth=1)
+        commit = repo.references[_UPDATE_REF].peel(pygit2.Commit)
+        repo.reset(commit.id, pygit2.GIT_RESET_HARD)
+
+    def _register_server(
+        self,
+        install_path: Path,
+        server_name: str,
+        server_file: Optional[str],
+        env_vars: Optional[Dict[str, str]],
+        auto_detect: bool
+    ) -> bool:
+        """Find the server file of a checkout and add the server to .mcp.json."""
         # Auto-detect server file
         if not server_file and auto_detect:
             server_file = self._detect_server_file(install_path)
@@ -166,20 +505,16 @@ class MCPInstaller:
 
         return True
 
-    def _install_dependencies(self, repo_path: Path, requirements_file: Optional[str]) -> bool:
+    async def _install_dependencies(self, repo_path: Path, requirements_file: Optional[str]) -> bool:
         """Install Python dependencies for the MCP server."""
         requirements_file = requirements_file or "requirements.txt"
         req_path = repo_path / requirements_file
 
         if req_path.exists():
             print(f"Installing dependencies from {requirements_file}...")
-            result = subprocess.run(
-                [self.venv_python, "-m", "pip", "install", "-r", str(req_path)],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode != 0:
-                print(f"✗ Failed to install dependencies: {result.stderr}")
+            returncode, stderr = await self._run(self._pip_install_cmd("-r", str(req_path)))
+            if returncode != 0:
+                print(f"✗ Failed to install dependencies: {stderr}")
                 return False
             print("✓ Dependencies installed")
         else:
@@ -187,6 +522,63 @@ class MCPInstaller:
 
         return True
 
+    async def _install_dependencies_bulk(self, req_paths: List[Path]) -> bool:
+        """
+        Install the dependencies of several servers in one pip run.
+
+        Every requirements file is passed with its own -r flag, so pip
+        resolves them together and relative paths inside each file still
+        resolve against that file. With more than one file, a --dry-run
+        resolve runs first, so conflicting requirements are caught before
+        anything is installed.
+
+        Args:
+            req_paths: Requirements files to install
+
+        Returns:
+            True if all dependencies were installed
+        """
+        print(f"Installing dependencies of {len(req_paths)} servers...")
+        req_args = [arg for req_path in req_paths for arg in ("-r", str(req_path))]
+
+        if len(req_paths) > 1:
+            returncode, stderr = await self._run(self._pip_install_cmd("--dry-run", *req_args))
+            # pip < 22.2 has no --dry-run; let the real install find conflicts
+            if returncode != 0 and "no such option" not in stderr:
+                print(f"⚠ Dependencies conflict, installing per server: {stderr}")
+                return False
+
+        returncode, stderr = await self._run(self._pip_install_cmd(*req_args))
+        if returncode != 0:
+            print(f"⚠ Combined dependency install failed, installing per server: {stderr}")
+            return False
+        print("✓ Dependencies installed")
+        return True
+
+    def _pip_install_cmd(self, *args: str) -> List[str]:
+        """
+        pip install command using a download cache shared by all installs.
+
+        Uses "uv pip install" targeting the venv's Python when uv is on PATH;
+        it accepts the same -r/--dry-run arguments and always prefers wheels.
+        """
+        if self._uv:
+            cmd = [
+                self._uv, "pip", "install",
+                "--python", self.venv_python,
+                "--cache-dir", str(self.cache_dir),
+            ]
+        else:
+            cmd = [
+                self.venv_python, "-m", "pip", "install",
+                "--cache-dir", str(self.cache_dir),
+                "--prefer-binary",
+            ]
+        if not self.verbose:
+            cmd.append("-q")
+        cmd.extend(args)
+        return cmd
+
     def _detect_server_file(self, repo_path: Path) -> Optional[str]:
         """
         Auto-detect the MCP server file in the repository.
@@ -204,30 +596,71 @@ class MCPInstaller:
             "app.py",
         ]
 
+        try:
+            with os.scandir(repo_path) as entries:
+                py_files = sorted(
+                    entry.name for entry in entries
+                    if entry.name.endswith(".py") and entry.is_file()
+                )
+        except OSError:
+            return None
+
         for candidate in candidates:
-            if (repo_path / candidate).exists():
+            if candidate in py_files:
                 return candidate
 
         # Look for *_server.py files
-        server_files = list(repo_path.glob("*_server.py"))
-        if server_files:
-            return server_files[0].name
+        for name in py_files:
+            if name.endswith("_server.py"):
+                return name
 
         # Look for files that import fastmcp
-        for py_file in repo_path.glob("*.py"):
-            try:
-                content = py_file.read_text()
-                if "fastmcp" in content.lower() or "from mcp" in content:
-                    return py_file.name
-            except:
-                continue
+        for name in py_files:
+            if self._mentions_mcp(repo_path / name):
+                return name
 
         return None
 
+    def _mentions_mcp(self, py_file: Path) -> bool:
+        """
+        Check whether the start of a file imports mcp or fastmcp.
+
+        The first IMPORT_SCAN_BYTES are parsed, so mentions in comments and
+        strings don't count. If the head doesn't parse (e.g. it ends inside
+        a docstring), its bytes are searched instead. A head without a single
+        complete line (e.g. minified code or a long license line) is searched
+        together with the next IMPORT_SCAN_BYTES.
+        """
+        try:
+            with open(py_file, "rb") as f:
+                head = f.read(IMPORT_SCAN_BYTES)
+                if len(head) == IMPORT_SCAN_BYTES:
+                    end = head.rfind(b"\n")
+                    if end < 0:
+                        head += f.read(IMPORT_SCAN_BYTES)
+                        return _MCP_IMPORT_RE.search(head) is not None
+                    head = head[:end + 1]  # drop the cut-off last line
+        except OSError:
+            return False
+
+        try:
+            tree = ast.parse(head.decode("utf-8", "ignore"))
+        except (SyntaxError, ValueError):
+            return _MCP_IMPORT_RE.search(head) is not None
+
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                modules = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and not node.level:
+                modules = [node.module or ""]
+            else:
+                continue
+            if any(module.partition(".")[0] in _MCP_PACKAGES for module in modules):
+                return True
+        return False
+
     def _add_to_config(self, server_name: str, server_path: Path, env_vars: Optional[Dict[str, str]]):
         """Add the server to .mcp.json configuration."""
-        config = self._load_config()
-
         server_config = {
             "command": self.venv_python,
             "args": [str(server_path.resolve())],
@@ -236,12 +669,15 @@ class MCPInstaller:
         if env_vars:
             server_config["env"] = env_vars
 
-        config["mcpServers"][server_name] = server_config
-        self._save_config(config)
+        with _config_lock:
+            config = copy.deepcopy(self._load_config())
+            config.setdefault("mcpServers", {})
+            config["mcpServers"][server_name] = server_config
+            self._save_config(config)
 
     def list_installed(self) -> List[Dict]:
         """List all installed MCP servers."""
-        config = self._load_config()
+        config = load_config(self.config_file, allow_stale=True)
         servers = []
 
         for name, server_config in config.get("mcpServers", {}).items():
@@ -268,35 +704,34 @@ class MCPInstaller:
         Returns:
             True if successful, False otherwise
         """
-        config = self._load_config()
+        with _config_lock:
+            config = copy.deepcopy(self._load_config())
 
-        if server_name not in config.get("mcpServers", {}):
-            print(f"✗ Server '{server_name}' not found in configuration")
-            return False
+            if server_name not in config.get("mcpServers", {}):
+                print(f"✗ Server '{server_name}' not found in configuration")
+                return False
 
-        # Get server path before removing from config
-        server_config = config["mcpServers"][server_name]
-        args = server_config.get("args", [])
-        server_path = Path(args[0]) if args else None
+            # Get server path before removing from config
+            server_config = config["mcpServers"][server_name]
+            args = server_config.get("args", [])
+            server_path = Path(args[0]) if args else None
 
-        # Remove from config
-        del config["mcpServers"][server_name]
-        self._save_config(config)
+            # Remove from config
+            del config["mcpServers"][server_name]
+            self._save_config(config)
         print(f"✓ Removed '{server_name}' from configuration")
 
         # Optionally delete files
         if delete_files and server_path:
-            # Find the repository root (assuming it's in mcp_dir)
-            repo_path = None
-            for part in server_path.parts:
-                if part == ".mcp_servers":
-                    idx = server_path.parts.index(part)
-                    if idx + 1 < len(server_path.parts):
-                        repo_path = self.mcp_dir / server_path.parts[idx + 1]
-                        break
-
-            if repo_path and repo_path.exists():
-                import shutil
+            # The repository root is the server path's first component below mcp_dir
+            try:
+                relative = server_path.resolve().relative_to(self.mcp_dir.resolve())
+            except ValueError:
+                relative = None  # not installed by us
+            # A script directly in mcp_dir has no repository to delete
+            repo_path = self.mcp_dir / relative.parts[0] if relative and len(relative.parts) > 1 else None
+
+            if repo_path and repo_path.is_dir():
                 shutil.rmtree(repo_path)
                 print(f"✓ Deleted files at {repo_path}")
 
@@ -308,6 +743,7 @@ def main():
     import argparse
 
     parser = argparse.ArgumentParser(description="Install MCP servers from git repositories")
+    parser.add_argument("--verbose", action="store_true", help="Show git and pip output")
     subparsers = parser.add_subparsers(dest="command", help="Command to run")
 
     # Install command
@@ -318,6 +754,16 @@ def main():
     install_parser.add_argument("--requirements", help="Requirements file (default: requirements.txt)")
     install_parser.add_argument("--env", action="append", help="Environment variable (KEY=VALUE)")
     install_parser.add_argument("--no-auto-detect", action="store_true", help="Disable auto-detection of server file")
+    install_parser.add_argument("--full-clone", action="store_true", help="Clone the full history instead of the latest commit")
+
+    # Batch install command
+    batch_parser = subparsers.add_parser("install-batch", help="Install several MCP servers from a manifest")
+    batch_parser.add_argument(
+        "manifest",
+        help="JSON file with a list of git URLs or install options "
+             '(e.g. [{"git_url": "...", "server_name": "...", "env_vars": {...}}])'
+    )
+    batch_parser.add_argument("--workers", type=int, default=4, help="Repositories fetched at the same time (default: 4)")
 
     # List command
     list_parser = subparsers.add_parser("list", help="List installed MCP servers")
@@ -333,7 +779,7 @@ def main():
         parser.print_help()
         return
 
-    installer = MCPInstaller()
+    installer = MCPInstaller(verbose=args.verbose)
 
     if args.command == "install":
         # Parse environment variables
@@ -343,16 +789,29 @@ def main():
                 key, value = env_str.split("=", 1)
                 env_vars[key] = value
 
-        success = installer.install_from_git(
+        success, _ = installer.install_from_git(
             git_url=args.git_url,
             server_name=args.name,
             server_file=args.server_file,
             env_vars=env_vars if env_vars else None,
             requirements_file=args.requirements,
-            auto_detect=not args.no_auto_detect
+            auto_detect=not args.no_auto_detect,
+            shallow=not args.full_clone
         )
         sys.exit(0 if success else 1)
 
+    elif args.command == "install-batch":
+        with open(args.manifest) as f:
+            manifest = json.load(f)
+        specs = [{"git_url": entry} if isinstance(entry, str) else entry for entry in manifest]
+
+        results = installer.install_many(specs, workers=args.workers)
+        failed = [name for success, name in results if not success]
+        print(f"\nInstalled {len(results) - len(failed)}/{len(results)} MCP servers")
+        if failed:
+            print(f"Failed: {', '.join(failed)}")
+        sys.exit(1 if failed else 0)
+
     elif args.command == "list":
         servers = installer.list_installed()
         if not servers:
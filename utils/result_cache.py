@@ -0,0 +1,107 @@
+"""
+Result Cache - Memoize tool results for servers with deterministic tools
+
+Results are keyed by (server, tool, arguments) and kept in a bounded LRU. Each
+entry is only served for the caching server's TTL, so caching is opt-in per
+server via "cache_ttl" in .mcp.json.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from .fast_json import dumpb
+
+DEFAULT_MAX_SIZE = 1024
+
+
+def compute_result_key(server_name: str, tool_name: str, parameters: Optional[Dict]) -> bytes:
+    """
+    Key a tool call by its server, tool and arguments.
+
+    Arguments are serialized with sorted keys so their order doesn't matter.
+
+    Args:
+        server_name: Name of the server
+        tool_name: Name of the tool
+        parameters: Tool parameters
+
+    Returns:
+        Digest identifying the call
+    """
+    data = b"|".join((
+        server_name.encode("utf-8"),
+        tool_name.encode("utf-8"),
+        dumpb(parameters or {}, sort_keys=True),
+    ))
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+class ResultCache:
+    """Thread-safe LRU of tool results with per-lookup TTLs."""
+
+    def __init__(self, maxsize: int = DEFAULT_MAX_SIZE):
+        """
+        Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of results kept; least recently used
+                results are evicted first
+        """
+        self.maxsize = maxsize
+        # key -> (server_name, result, stored_at)
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: bytes, ttl: float) -> Optional[Any]:
+        """
+        Get a cached result.
+
+        Args:
+            key: Key from compute_result_key()
+            ttl: Seconds a result stays valid
+
+        Returns:
+            The result, or None on a miss or if it expired
+        """
+        with self.lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[2] >= ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: bytes, server_name: str, result: Any):
+        """
+        Store a result.
+
+        Args:
+            key: Key from compute_result_key()
+            server_name: Server that produced the result
+            result: Tool result
+        """
+        with self.lock:
+            self._entries[key] = (server_name, result, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, server_name: Optional[str] = None):
+        """
+        Drop cached results.
+
+        Args:
+            server_name: Server whose results to drop (default: all results)
+        """
+        with self.lock:
+            if server_name is None:
+                self._entries.clear()
+                return
+            stale = [key for key, entry in self._entries.items() if entry[0] == server_name]
+            for key in stale:
+                del self._entries[key]
@@ -0,0 +1,178 @@
+"""
+Result Store - Spill large tool results to disk
+
+Tool results above a size threshold are written to ~/.mcp_proxy/cache and
+replaced by a small handle with a preview. The full payload can then be
+fetched page by page instead of flowing through the LLM context at once.
+
+Spilled results are pruned when the store is created and after each spill:
+files older than max_age are deleted, then the oldest files until the cache
+fits in max_bytes.
+"""
+
+import os
+import re
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .fast_json import dumpb
+
+HANDLE_PREFIX = "mcp-proxy://cache/"
+_HANDLE_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+def _utf8_boundary(data: bytes, limit: int) -> int:
+    """Largest cut point <= limit that doesn't split a UTF-8 character."""
+    cut = min(limit, len(data))
+
+    # Find the lead byte of the last character before the cut
+    lead = cut - 1
+    while lead > 0 and cut - lead < 4 and (data[lead] & 0xC0) == 0x80:
+        lead -= 1
+    if lead < 0:
+        return cut
+
+    first = data[lead]
+    width = 1 if first < 0x80 else 2 if first < 0xE0 else 3 if first < 0xF0 else 4
+    return cut if cut - lead >= width else lead
+
+
+class ResultStore:
+    """Spill oversized tool results to disk and serve them back in pages."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        threshold: int = 32 * 1024,
+        preview_size: int = 2 * 1024,
+        max_age: float = 24 * 3600,
+        max_bytes: int = 256 * 1024 * 1024
+    ):
+        """
+        Initialize the result store.
+
+        Args:
+            cache_dir: Directory for spilled results (default: ~/.mcp_proxy/cache)
+            threshold: Serialized size in bytes above which results are spilled
+            preview_size: Number of bytes included inline as a preview
+            max_age: Seconds a spilled result is kept
+            max_bytes: Total size of spilled results kept; the oldest are
+                deleted first
+        """
+        self.cache_dir = cache_dir or Path.home() / ".mcp_proxy" / "cache"
+        self.threshold = threshold
+        self.preview_size = preview_size
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self._prune()
+
+    def maybe_spill(self, result: Any) -> Any:
+        """
+        Replace a result with a handle if it is too large to return inline.
+
+        Args:
+            result: Tool result
+
+        Returns:
+            The result itself, or a handle dict for spilled results
+        """
+        data = dumpb(result)
+        if len(data) <= self.threshold:
+            return result
+
+        result_id = uuid.uuid4().hex
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        (self.cache_dir / f"{result_id}.json").write_bytes(data)
+        self._prune(keep=f"{result_id}.json")
+
+        return {
+            "success": True,
+            "handle": HANDLE_PREFIX + result_id,
+            "size": len(data),
+            "preview": data[:_utf8_boundary(data, self.preview_size)].decode("utf-8"),
+            "note": "Result too large to return inline. Use fetch_result_handle(handle, offset, length) to read it."
+        }
+
+    def fetch(self, handle: str, offset: int = 0, length: int = 32 * 1024) -> Dict:
+        """
+        Read a page of a spilled result.
+
+        Args:
+            handle: Handle returned by maybe_spill()
+            offset: Byte offset to start reading from
+            length: Maximum number of bytes to read
+
+        Returns:
+            Dictionary with the requested slice of the serialized result
+        """
+        result_id = handle[len(HANDLE_PREFIX):] if handle.startswith(HANDLE_PREFIX) else ""
+        if not _HANDLE_ID.match(result_id):
+            return {
+                "success": False,
+                "error": f"Invalid result handle: {handle}"
+            }
+
+        offset = max(0, offset)
+        length = max(4, length)  # Room for at least one full UTF-8 character
+        try:
+            with open(self.cache_dir / f"{result_id}.json", "rb") as f:
+                size = os.fstat(f.fileno()).st_size
+                f.seek(offset)
+                data = f.read(length)
+        except FileNotFoundError:
+            return {
+                "success": False,
+                "error": f"Result handle not found (it may have been cleaned up): {handle}"
+            }
+
+        # Don't split a multi-byte character across pages
+        if offset + len(data) < size:
+            data = data[:_utf8_boundary(data, len(data))]
+
+        end = offset + len(data)
+        return {
+            "success": True,
+            "handle": handle,
+            "offset": offset,
+            "length": len(data),
+            "size": size,
+            "data": data.decode("utf-8", errors="replace"),
+            "next_offset": end if end < size else None
+        }
+
+    def _prune(self, keep: Optional[str] = None):
+        """
+        Delete expired spilled results, then the oldest ones over max_bytes.
+
+        Args:
+            keep: File name never deleted (the result just spilled)
+        """
+        try:
+            with os.scandir(self.cache_dir) as entries:
+                files = []
+                for entry in entries:
+                    if not entry.name.endswith(".json"):
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue  # deleted concurrently
+                    files.append((st.st_mtime, st.st_size, entry.name))
+        except OSError:
+            return  # nothing spilled yet
+
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        expired_before = time.time() - self.max_age
+        for mtime, size, name in files:
+            if name == keep:
+                continue
+            if mtime >= expired_before and total <= self.max_bytes:
+                break  # files are oldest first; the rest are kept
+            try:
+                os.unlink(self.cache_dir / name)
+            except OSError:
+                continue
+            total -= size
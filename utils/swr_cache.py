@@ -0,0 +1,106 @@
+"""
+Stale-While-Revalidate Cache
+
+Small in-process cache that serves fresh entries directly, serves stale
+entries immediately while refreshing them on a background thread, and keeps
+serving the stale value if the refresh fails.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class SWRCache:
+    """In-process stale-while-revalidate cache."""
+
+    def __init__(self, ttl_fresh: float, ttl_stale: float):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl_fresh: Seconds an entry is served without revalidation
+            ttl_stale: Seconds past ttl_fresh during which the stale entry is
+                still served while it is refreshed in the background. Older
+                entries are refreshed synchronously.
+        """
+        self.ttl_fresh = ttl_fresh
+        self.ttl_stale = ttl_stale
+        self._entries: Dict[Hashable, Tuple[Any, float]] = {}  # key -> (value, fetched_at)
+        self._refreshing = set()  # keys with a background refresh in flight
+        self._generation = 0  # bumped by invalidate() so in-flight refreshes are discarded
+        self.lock = threading.Lock()
+
+    def get(self, key: Hashable, fetch: Callable[[], Any]) -> Any:
+        """
+        Get a value, fetching or revalidating it as needed.
+
+        Args:
+            key: Cache key
+            fetch: Callable producing the current value (may raise)
+
+        Returns:
+            Cached or freshly fetched value
+        """
+        with self.lock:
+            entry = self._entries.get(key)
+
+        if entry is not None:
+            value, fetched_at = entry
+            age = time.monotonic() - fetched_at
+            if age < self.ttl_fresh:
+                return value
+            if age < self.ttl_fresh + self.ttl_stale:
+                self._refresh_in_background(key, fetch)
+                return value
+
+        try:
+            value = fetch()
+        except Exception:
+            if entry is not None:
+                return entry[0]  # Keep serving stale data when the source is down
+            raise
+
+        self.set(key, value)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        """Store a freshly fetched value."""
+        with self.lock:
+            self._entries[key] = (value, time.monotonic())
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """
+        Drop cached entries.
+
+        Args:
+            key: Entry to drop (default: all entries)
+        """
+        with self.lock:
+            self._generation += 1
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def _refresh_in_background(self, key: Hashable, fetch: Callable[[], Any]):
+        """Refresh an entry on a daemon thread, at most once at a time per key."""
+        with self.lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            generation = self._generation
+
+        def refresh():
+            try:
+                value = fetch()
+                with self.lock:
+                    if generation == self._generation:
+                        self._entries[key] = (value, time.monotonic())
+            except Exception:
+                pass  # Keep serving the stale value
+            finally:
+                with self.lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
@@ -0,0 +1,147 @@
+"""
+Tool Catalog - Persistent cache of discovered MCP server tools
+
+Stores each server's tools/list result in a JSON file next to .mcp.json so
+that loading a server again (in this or a later session) can serve its tools
+without starting the process. Entries are keyed by the server's launch config
+plus the modification times of its command and script files, so they go
+stale as soon as the server code changes.
+"""
+
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from .fast_json import dumpb, loads
+
+CATALOG_FILENAME = "_tool_cache.json"
+
+
+def _mtime(path: Optional[str]) -> Optional[int]:
+    """Modification time of a file in ns, or None if it isn't a file."""
+    if not path:
+        return None
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def compute_catalog_key(server_config: Dict) -> str:
+    """
+    Key a server's cached tools by everything that can change them.
+
+    Args:
+        server_config: Server entry from .mcp.json
+
+    Returns:
+        Hex digest of the launch config and the command/script mtimes
+    """
+    command = server_config.get("command")
+    args = list(server_config.get("args", []))
+    cwd = server_config.get("cwd")
+    key = {
+        "command": command,
+        "args": args,
+        "env": sorted(server_config.get("env", {}).items()),
+        "cwd": cwd,
+        # Relative script paths are relative to the server's cwd
+        "mtimes": [_mtime(shutil.which(command) if command else None)]
+                  + [_mtime(os.path.join(cwd, arg) if cwd and isinstance(arg, str) else arg)
+                     for arg in args],
+    }
+    return hashlib.blake2b(dumpb(key), digest_size=20).hexdigest()
+
+
+class ToolCatalog:
+    """Persistent catalog key -> {tool_name: tool_info}, written through atomically."""
+
+    def __init__(self, path: Path):
+        """
+        Initialize the catalog.
+
+        Args:
+            path: JSON file backing the catalog (read lazily on first use)
+        """
+        self.path = Path(path)
+        self._entries = None  # key -> tools, loaded on first access
+        self.lock = threading.Lock()
+
+    def _ensure_loaded(self):
+        """Read the catalog file. Caller must hold self.lock."""
+        if self._entries is not None:
+            return
+        try:
+            self._entries = loads(self.path.read_bytes())
+        except (OSError, ValueError):
+            self._entries = {}
+        if not isinstance(self._entries, dict):
+            self._entries = {}
+
+    def get(self, key: str) -> Optional[Dict[str, Dict]]:
+        """
+        Get the cached tools for a key.
+
+        Args:
+            key: Catalog key from compute_catalog_key()
+
+        Returns:
+            A fresh {tool_name: tool_info} dict, or None on a miss
+        """
+        with self.lock:
+            self._ensure_loaded()
+            tools = self._entries.get(key)
+            if not isinstance(tools, dict):
+                return None
+            return {name: dict(info) for name, info in tools.items()}
+
+    def put(self, key: str, tools: Dict[str, Dict]):
+        """
+        Store the tools for a key and write the catalog to disk.
+
+        Private (underscore-prefixed) fields such as precomputed search data
+        are not persisted.
+
+        Args:
+            key: Catalog key from compute_catalog_key()
+            tools: Discovered tools
+        """
+        entry = {
+            name: {field: value for field, value in info.items() if not field.startswith("_")}
+            for name, info in tools.items()
+        }
+        with self.lock:
+            self._ensure_loaded()
+            if self._entries.get(key) == entry:
+                return
+            self._entries[key] = entry
+            self._write()
+
+    def invalidate(self, key: str):
+        """Drop the cached tools for a key."""
+        with self.lock:
+            self._ensure_loaded()
+            if self._entries.pop(key, None) is not None:
+                self._write()
+
+    def _write(self):
+        """Atomically replace the catalog file. Caller must hold self.lock."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(
+                dir=self.path.parent, prefix=self.path.name, suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(dumpb(self._entries))
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            print(f"Warning: Could not write tool cache {self.path}: {e}", file=sys.stderr)
@@ -2,9 +2,103 @@
 Tool Searcher - Dynamic tool discovery for MCP Proxy
 
 Discovers and searches tools from dynamically loaded MCP servers.
+
+Search results are served from a compact index (name, server and a one-line
+summary). Full schemas are only hydrated on demand via get_tool_info() or
+when detail="full" is requested.
+
+Searches run against a token -> tools inverted index that is updated
+incrementally whenever the server loader loads, unloads or refreshes a
+server, and candidates are ranked with BM25. Tool text is lowercased and
+tokenized once, when the loader discovers the tools (see preprocess_tool()).
+Invalidated servers are re-indexed on a background thread right away, so the
+next query normally finds the index already up to date.
+
+Queries that share no token with any tool fall back to fuzzy matching with
+rapidfuzz when it is installed, or to substring matches on tool names, which
+are looked up through a trigram index of the names.
 """
 
-from typing import List, Dict, Any, Optional
+import heapq
+import math
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Set
+
+try:
+    from rapidfuzz import fuzz, process as fuzz_process
+except ImportError:  # pragma: no cover - rapidfuzz is optional
+    fuzz = fuzz_process = None
+
+# Sentence boundary used to cut descriptions down to a one-line summary
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# BM25 parameters
+_K1 = 1.2
+_B = 0.75
+# Tool name tokens count this many times towards term frequency
+_NAME_WEIGHT = 3
+# Bonus when the whole query appears in the tool name
+_EXACT_NAME_BONUS = 10.0
+# Score per query word found inside a tool name when no token matched at all
+_PARTIAL_NAME_SCORE = 1.0
+# Minimum rapidfuzz similarity (0-100) for fuzzy fallback matches
+_FUZZY_CUTOFF = 70
+
+# Applies invalidations off the query path; one worker, as every rebuild
+# takes the searcher's lock anyway
+_index_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tool-index")
+
+
+def _summarize(description: str) -> str:
+    """Reduce a tool description to its first line / first sentence."""
+    text = description.strip()
+    if not text:
+        return ""
+    first_line = text.splitlines()[0]
+    return _SENTENCE_END.split(first_line, 1)[0]
+
+
+def _trigrams(text: str) -> Set[str]:
+    """All 3-character substrings of a string."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def preprocess_tool(tool_name: str, tool_info: Dict) -> Dict:
+    """
+    Attach precomputed search fields to a tool's info dict (in place).
+
+    Called once by the server loader when a server's tools are discovered, so
+    searches never lowercase or tokenize text.
+
+    Args:
+        tool_name: Name of the tool
+        tool_info: Tool info dict as discovered from the server
+
+    Returns:
+        The same dict, with "_name_lower", "_search_blob", "_summary",
+        "_term_freqs" and "_tokens" set
+    """
+    description = tool_info.get("description", "")
+    name_lower = tool_name.lower()
+    description_lower = description.lower()
+    name_tokens = _TOKEN.findall(name_lower)
+
+    term_freqs = {}
+    for token in name_tokens:
+        term_freqs[token] = term_freqs.get(token, 0) + _NAME_WEIGHT
+    for token in _TOKEN.findall(description_lower):
+        term_freqs[token] = term_freqs.get(token, 0) + 1
+
+    tool_info["_name_lower"] = name_lower
+    tool_info["_search_blob"] = " ".join(name_tokens) + " " + description_lower
+    tool_info["_summary"] = _summarize(description)
+    tool_info["_term_freqs"] = term_freqs
+    tool_info["_tokens"] = frozenset(term_freqs)
+    return tool_info
 
 
 class ToolSearcher:
@@ -22,81 +116,339 @@ class ToolSearcher:
             server_loader: DynamicServerLoader instance to get tools from
         """
         self.server_loader = server_loader
-        self._cached_tools = {}
+        self._index = {}  # tool_name -> {"server": ..., "summary": ...}
+        self._schemas = {}  # tool_name -> (source tool info, hydrated tool info)
+
+        self._server_index = {}  # server_name -> [tool_name, ...]
+        self._postings: Dict[str, Set[str]] = {}  # token -> {tool_name, ...}
+        self._name_trigrams: Dict[str, Set[str]] = {}  # trigram of a lowercase name -> {tool_name, ...}
+        self._term_freqs = {}  # tool_name -> {token: weighted term frequency}
+        self._doc_len = {}  # tool_name -> weighted token count
+        self._total_len = 0
+        self._bm25_idf = {}  # token -> idf, cleared whenever the index changes
+        self._bm25_norm = {}  # tool_name -> length normalization, cleared likewise
+
+        # Bumped whenever the index changes; views derived from the whole
+        # index are memoized against it
+        self._version = 0
+        self._sorted_names = (-1, [])  # (version, sorted tool names)
+        self._fuzzy_choices = (-1, {})  # (version, {tool_name: search_blob})
+
+        self._dirty = set()  # servers whose postings need rebuilding
+        self._synced = False  # False until the initial full build has run
+        self._rebuild_scheduled = False  # a background _rebuild_index() is queued
+        self.lock = threading.Lock()
+
+        if server_loader is not None and hasattr(server_loader, "add_listener"):
+            server_loader.add_listener(self.invalidate)
 
-    def _get_all_tools(self) -> Dict[str, Dict[str, Any]]:
+    def invalidate(self, server_name: str):
         """
-        Get all tools from loaded servers.
+        Mark a server's tools as changed.
 
-        Returns:
-            Dictionary mapping tool names to their info
+        Called by the server loader after a server is loaded, unloaded or has
+        its tools refreshed. Only that server's postings are rebuilt on the
+        next query, or sooner by a background rebuild.
+
+        Args:
+            server_name: Name of the server whose tools changed
         """
+        with self.lock:
+            self._dirty.add(server_name)
+            if self._rebuild_scheduled:
+                return  # the queued rebuild will pick this server up too
+            self._rebuild_scheduled = True
+        try:
+            _index_executor.submit(self._rebuild_index)
+        except RuntimeError:
+            # Executor shut down (interpreter exit): the next query syncs
+            with self.lock:
+                self._rebuild_scheduled = False
+
+    def _rebuild_index(self):
+        """Apply pending invalidations in the background."""
+        with self.lock:
+            # Invalidations arriving from here on schedule another rebuild
+            self._rebuild_scheduled = False
+            try:
+                self._sync()
+            except Exception as e:
+                # The next query retries the remaining invalidations
+                print(f"Warning: Background tool index rebuild failed: {e}", file=sys.stderr)
+
+    def _remove_tool(self, tool_name: str):
+        """Drop a tool from the index, its postings and its hydrated schema."""
+        entry = self._index.pop(tool_name, None)
+        self._schemas.pop(tool_name, None)
+        if entry is not None:
+            for trigram in _trigrams(entry["name_lower"]):
+                postings = self._name_trigrams.get(trigram)
+                if postings is not None:
+                    postings.discard(tool_name)
+                    if not postings:
+                        del self._name_trigrams[trigram]
+        for token in self._term_freqs.pop(tool_name, {}):
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.discard(tool_name)
+                if not postings:
+                    del self._postings[token]
+        self._total_len -= self._doc_len.pop(tool_name, 0)
+
+    def _remove_server(self, server_name: str) -> List[str]:
+        """Drop all tools contributed by a server. Returns the removed tool names."""
+        removed = []
+        for tool_name in self._server_index.pop(server_name, []):
+            if self._index.get(tool_name, {}).get("server") == server_name:
+                self._remove_tool(tool_name)
+                removed.append(tool_name)
+        return removed
+
+    def _add_tool(self, server_name: str, tool_name: str, tool_info: Dict):
+        """Index a single tool."""
+        if tool_name in self._index:
+            # Same tool name on another server: the newest one wins
+            self._remove_tool(tool_name)
+
+        if "_tokens" not in tool_info:
+            # Not discovered through the loader: preprocess a private copy
+            tool_info = preprocess_tool(tool_name, dict(tool_info))
+
+        self._index[tool_name] = {
+            "server": server_name,
+            "summary": tool_info["_summary"],
+            "name_lower": tool_info["_name_lower"],
+            "search_blob": tool_info["_search_blob"]
+        }
+
+        term_freqs = tool_info["_term_freqs"]
+        self._term_freqs[tool_name] = term_freqs
+        doc_len = sum(term_freqs.values())
+        self._doc_len[tool_name] = doc_len
+        self._total_len += doc_len
+        for token in tool_info["_tokens"]:
+            self._postings.setdefault(token, set()).add(tool_name)
+        for trigram in _trigrams(tool_info["_name_lower"]):
+            self._name_trigrams.setdefault(trigram, set()).add(tool_name)
+
+    def _add_server(self, server_name: str, server_tools: Dict[str, Dict]):
+        """Index all tools of a server."""
+        for tool_name, tool_info in server_tools.items():
+            self._add_tool(server_name, tool_name, tool_info)
+        self._server_index[server_name] = list(server_tools)
+
+    def _sync(self):
+        """Apply pending invalidations to the index. Caller must hold self.lock."""
         if not self.server_loader:
-            return {}
+            return
+
+        if not self._synced:
+            self._dirty.update(self._server_index.keys())
+            self._dirty.update(self.server_loader.server_tools.keys())
+            self._synced = True
+
+        if not self._dirty:
+            return
+
+        removed = []
+        for server_name in self._dirty:
+            removed.extend(self._remove_server(server_name))
+            server_tools = self.server_loader.server_tools.get(server_name)
+            if server_tools is not None:
+                self._add_server(server_name, dict(server_tools))
 
-        all_tools = {}
-        loaded = self.server_loader.get_loaded_servers()
+        # A removed tool may still be provided by another loaded server
+        for tool_name in removed:
+            if tool_name in self._index:
+                continue
+            for server_name, tool_names in self._server_index.items():
+                tool_info = self.server_loader.server_tools.get(server_name, {}).get(tool_name)
+                if tool_name in tool_names and tool_info is not None:
+                    self._add_tool(server_name, tool_name, tool_info)
+                    break
 
-        for server in loaded.get("servers", []):
-            server_name = server.get("name", "")
-            server_tools = self.server_loader.server_tools.get(server_name, {})
+        self._dirty.clear()
+        self._bm25_idf.clear()
+        self._bm25_norm.clear()
+        self._version += 1
 
-            for tool_name, tool_info in server_tools.items():
-                all_tools[tool_name] = {
-                    "name": tool_name,
-                    "server": server_name,
-                    "description": tool_info.get("description", ""),
-                    "inputSchema": tool_info.get("inputSchema", {})
-                }
+    def _idf(self, token: str) -> float:
+        """BM25 inverse document frequency of a token."""
+        idf = self._bm25_idf.get(token)
+        if idf is None:
+            total = len(self._term_freqs)
+            df = len(self._postings.get(token, ()))
+            idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+            self._bm25_idf[token] = idf
+        return idf
 
-        return all_tools
+    def _bm25(self, tool_name: str, query_tokens: Set[str], avg_len: float) -> float:
+        """BM25 score of a tool for the given query tokens."""
+        term_freqs = self._term_freqs[tool_name]
+        norm = self._bm25_norm.get(tool_name)
+        if norm is None:
+            norm = _K1 * (1 - _B + _B * self._doc_len[tool_name] / avg_len)
+            self._bm25_norm[tool_name] = norm
 
-    def search_tools(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
+        # Only the tokens the tool actually contains contribute (C-level set
+        # intersection instead of probing every query token)
+        score = 0.0
+        for token in query_tokens & term_freqs.keys():
+            tf = term_freqs[token]
+            score += self._idf(token) * tf * (_K1 + 1) / (tf + norm)
+        return score
+
+    def _hydrate(self, tool_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the full schema for a tool, populating the schema cache lazily.
+
+        Args:
+            tool_name: Name of the tool (must be present in the index)
+
+        Returns:
+            Full tool information dict or None if not found
+        """
+        entry = self._index.get(tool_name)
+        if entry is None:
+            return None
+
+        server_name = entry["server"]
+        tool_info = self.server_loader.server_tools.get(server_name, {}).get(tool_name)
+        if tool_info is None:
+            return None
+
+        # Reuse the cached schema as long as the server hasn't re-discovered its tools
+        cached = self._schemas.get(tool_name)
+        if cached and cached[0] is tool_info:
+            return cached[1]
+
+        hydrated = {
+            "name": tool_name,
+            "server": server_name,
+            "description": tool_info.get("description", ""),
+            "inputSchema": tool_info.get("inputSchema", {})
+        }
+        if "outputSchema" in tool_info:
+            hydrated["outputSchema"] = tool_info["outputSchema"]
+
+        self._schemas[tool_name] = (tool_info, hydrated)
+        return hydrated
+
+    def _format(self, tool_name: str, detail: str) -> Optional[Dict[str, Any]]:
+        """
+        Format a tool entry at the requested level of detail.
+
+        Returns None for detail="full" if the tool's server no longer has it
+        (unloaded since the index was last synced).
+        """
+        if detail == "full":
+            hydrated = self._hydrate(tool_name)
+            return dict(hydrated) if hydrated is not None else None
+
+        entry = self._index[tool_name]
+        return {
+            "name": tool_name,
+            "server": entry["server"],
+            "description": entry["summary"]
+        }
+
+    def search_tools(
+        self,
+        query: str,
+        max_results: int = 5,
+        detail: str = "index"
+    ) -> List[Dict[str, Any]]:
         """
         Search for tools matching the query.
 
         Args:
             query: Natural language search query
             max_results: Maximum number of tools to return
+            detail: "index" for name/server/summary only, "full" to include schemas
 
         Returns:
             List of matching tools with relevance scores
         """
+        with self.lock:
+            self._sync()
+            return self._search(query, max_results, detail)
+
+    def _search(self, query: str, max_results: int, detail: str) -> List[Dict[str, Any]]:
+        """Run a search against the synced index. Caller must hold self.lock."""
         query_lower = query.lower()
-        query_words = set(query_lower.split())
+        query_tokens = set(_TOKEN.findall(query_lower))
         results = []
 
-        all_tools = self._get_all_tools()
+        # Candidates are the tools sharing at least one token with the query
+        candidates = set()
+        for token in query_tokens:
+            candidates.update(self._postings.get(token, ()))
 
-        for tool_name, tool_info in all_tools.items():
-            score = 0
-            description = tool_info.get("description", "").lower()
+        if candidates:
+            avg_len = (self._total_len / len(self._term_freqs)) or 1.0
+            for tool_name in candidates:
+                score = self._bm25(tool_name, query_tokens, avg_len)
+                if query_lower in self._index[tool_name]["name_lower"]:
+                    score += _EXACT_NAME_BONUS
+                results.append((score, tool_name))
+        elif fuzz_process is not None:
+            # No whole-token match: fuzzy-match names and descriptions (typos etc.)
+            matches = fuzz_process.extract(
+                query_lower,
+                self._memoized("_fuzzy_choices", lambda: {
+                    name: entry["search_blob"] for name, entry in self._index.items()
+                }),
+                scorer=fuzz.partial_ratio,
+                limit=max_results,
+                score_cutoff=_FUZZY_CUTOFF
+            )
+            for _, similarity, tool_name in matches:
+                results.append((similarity / 100 * _PARTIAL_NAME_SCORE, tool_name))
+        else:
+            # No whole-token match: fall back to partial matches in tool names
+            hits = {}
+            for word in query_lower.split():
+                for tool_name in self._names_containing(word):
+                    hits[tool_name] = hits.get(tool_name, 0) + 1
+            for tool_name, count in hits.items():
+                results.append((count * _PARTIAL_NAME_SCORE, tool_name))
 
-            # Exact tool name match
-            if query_lower in tool_name.lower():
-                score += 20
+        # Select the top results without sorting all matches
+        top = heapq.nlargest(max_results, results, key=lambda x: x[0])
 
-            # Word matches in tool name
-            for word in query_words:
-                if word in tool_name.lower():
-                    score += 10
+        formatted = []
+        for score, tool_name in top:
+            entry = self._format(tool_name, detail)
+            if entry is None:
+                continue
+            info = {"tool": tool_name}
+            info.update(entry)
+            del info["name"]
+            info["score"] = round(score, 3)
+            formatted.append(info)
+        return formatted
 
-            # Word matches in description
-            for word in query_words:
-                if word in description:
-                    score += 5
+    def _memoized(self, attr: str, build):
+        """Get a view of the whole index, rebuilding it only after changes."""
+        version, value = getattr(self, attr)
+        if version != self._version:
+            value = build()
+            setattr(self, attr, (self._version, value))
+        return value
 
-            if score > 0:
-                results.append({
-                    "tool": tool_name,
-                    "server": tool_info.get("server", ""),
-                    "description": tool_info.get("description", ""),
-                    "score": score
-                })
+    def _names_containing(self, word: str) -> List[str]:
+        """Tools whose lowercase name contains word. Caller must hold self.lock."""
+        if len(word) < 3:
+            return [name for name, entry in self._index.items() if word in entry["name_lower"]]
 
-        # Sort by score and return top results
-        results.sort(key=lambda x: x["score"], reverse=True)
-        return results[:max_results]
+        # Only names sharing every trigram of the word can contain it
+        candidates = None
+        for trigram in _trigrams(word):
+            postings = self._name_trigrams.get(trigram)
+            if not postings:
+                return []
+            candidates = set(postings) if candidates is None else candidates & postings
+        return [name for name in candidates if word in self._index[name]["name_lower"]]
 
     def get_tool_info(self, tool_name: str) -> Optional[Dict[str, Any]]:
         """
@@ -108,35 +460,56 @@ class ToolSearcher:
         Returns:
             Tool information dict or None if not found
         """
-        all_tools = self._get_all_tools()
-        return all_tools.get(tool_name)
+        with self.lock:
+            self._sync()
+            return self._hydrate(tool_name)
 
-    def list_all_tools(self) -> List[Dict[str, str]]:
+    def list_all_tools(
+        self,
+        detail: str = "index",
+        cache_only: bool = False,
+        force_rebuild: bool = False
+    ) -> List[Dict[str, Any]]:
         """
         List all available tools from loaded servers.
 
+        Args:
+            detail: "index" for name/server/summary only, "full" to include schemas
+            cache_only: Serve the current index as-is, without applying
+                pending invalidations (may be stale)
+            force_rebuild: Re-list tools from every server and rebuild the
+                whole index
+
         Returns:
             List of tool info dicts
         """
-        all_tools = self._get_all_tools()
-        return [
-            {
-                "name": name,
-                "server": info.get("server", ""),
-                "description": info.get("description", "")[:100]
-            }
-            for name, info in sorted(all_tools.items())
-        ]
+        if force_rebuild and self.server_loader:
+            self.server_loader.get_loaded_servers(force_rebuild=True)
+        elif not cache_only and hasattr(self.server_loader, "revalidate_tools"):
+            # Stale tool lists are refreshed in the background and picked up next call
+            self.server_loader.revalidate_tools()
 
-    def list_servers(self) -> List[str]:
+        with self.lock:
+            if force_rebuild:
+                self._synced = False
+            if not cache_only or not self._synced:
+                self._sync()
+            names = self._memoized("_sorted_names", lambda: sorted(self._index))
+            entries = (self._format(name, detail) for name in names)
+            return [entry for entry in entries if entry is not None]
+
+    def list_servers(self, cache_only: bool = False) -> List[str]:
         """
         List all loaded servers.
 
+        Args:
+            cache_only: Use the loader's last snapshot instead of probing processes
+
         Returns:
             List of server names
         """
         if not self.server_loader:
             return []
 
-        loaded = self.server_loader.get_loaded_servers()
+        loaded = self.server_loader.get_loaded_servers(cache_only=cache_only)
         return [s.get("name", "") for s in loaded.get("servers", [])]